@@ -5,7 +5,7 @@ from . import widgets # noqa
 from . import layout # noqa
 
 from .interact import interact # noqa
-from .layout import Row, Column, Tabs, Spacer # noqa
+from .layout import Row, Column, Tabs, Spacer, VirtualColumn # noqa
 from .pane import Pane # noqa
 from .param import Param # noqa
 from .util import load_notebook as _load_nb
@@ -6,15 +6,24 @@ objects and their widgets and support for Links
 from __future__ import absolute_import
 
 import sys
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from functools import partial
 
 import param
 from bokeh.layouts import Row as _BkRow
+from bokeh.models import Div as _BkDiv
 
 from .layout import Layout, WidgetBox
-from .pane import PaneBase, Pane
+from .pane import DivPaneBase, PaneBase, Pane
+from .util import LRUCache, hashable, model_spec, models_from_spec
 from .viewable import Viewable
 
+# Renderer instances keyed by renderer class, mode and class settings
+_renderer_cache = {}
+
+# Specifications of static bokeh plots shared between sessions
+_plot_cache = LRUCache(max_items=32)
+
 
 class HoloViews(PaneBase):
     """
@@ -34,12 +43,30 @@ class HoloViews(PaneBase):
         A mapping from dimension name to a widget instance which will
         be used to override the default widgets.""")
 
+    cache_size = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of rendered frames to cache, keyed by the widget values.
+        Only applies to backends other than bokeh which render each
+        frame to an image, e.g. matplotlib.""")
+
+    cache_plot = param.Boolean(default=False, doc="""
+        Whether to share a serialized copy of the plot between all
+        documents rendering the same object with the same options,
+        so each new session only pays for instantiating a copy of the
+        bokeh models. Only applies to static bokeh plots, i.e. plots
+        without widgets, streams or links.""")
+
+    prefetch = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of neighboring widget positions in each direction to
+        precompute in the background after each update, populating
+        the frame cache and the cache of a DynamicMap.""")
+
     precedence = 0.8
 
     def __init__(self, object, **params):
         super(HoloViews, self).__init__(object, **params)
         self.widget_box = WidgetBox()
         self._plots = {}
+        self._frames = None
 
     @classmethod
     def applies(cls, obj):
@@ -53,9 +80,62 @@ class HoloViews(PaneBase):
         Traverses HoloViews object to find and clean up any streams
         connected to existing plots.
         """
-        self._plots.pop(model.ref['id']).cleanup()
+        plot = self._plots.pop(model.ref['id'], None)
+        if plot is not None:
+            plot.cleanup()
         super(HoloViews, self)._cleanup(model, final)
 
+    @classmethod
+    def _renderer_instance(cls, renderer, mode):
+        """
+        Returns a renderer instance for the mode, reusing instances
+        unless the settings on the renderer class have changed.
+        """
+        rtype = type(renderer)
+        settings = tuple((k, id(v)) for k, v in rtype.param.get_param_values())
+        key = (rtype, mode, settings)
+        if key not in _renderer_cache:
+            _renderer_cache[key] = rtype.instance(mode=mode)
+        return _renderer_cache[key]
+
+    def _plot_key(self, comm):
+        """
+        Returns the key of the plot in the shared plot cache or None
+        if the plot should not be cached.
+        """
+        from holoviews import Store
+        backend = self.backend or Store.current_backend
+        if not self.cache_plot or backend != 'bokeh':
+            return None
+        try:
+            from holoviews.plotting.links import Link
+        except ImportError:
+            pass
+        else:
+            if Link.registry:
+                return None
+        renderer = Store.renderers[backend]
+        mode = 'server' if comm is None else 'default'
+        params = tuple((k, hashable(v)) for k, v in self.get_param_values()
+                       if k not in ('object', 'name'))
+        return (id(self.object), self.object.id, mode,
+                id(self._renderer_instance(renderer, mode)),
+                self._options_key(backend), params)
+
+    def _options_key(self, backend):
+        """
+        Returns a key capturing the options resolved for the object and
+        each of its nested objects, covering both options applied to
+        the objects and changes to the default options.
+        """
+        from holoviews import Store
+        options = []
+        for obj in self.object.traverse(lambda x: x):
+            for group in ('plot', 'style', 'norm'):
+                kwargs = Store.lookup_options(backend, obj, group).kwargs
+                options.append(repr(sorted(kwargs.items())))
+        return tuple(options)
+
     def _render(self, doc, comm, root):
         from holoviews import Store, renderer
         if not Store.renderers:
@@ -65,7 +145,7 @@ class HoloViews(PaneBase):
         backend = self.backend or Store.current_backend
         renderer = Store.renderers[backend]
         if backend == 'bokeh':
-            renderer = renderer.instance(mode='server' if comm is None else 'default')
+            renderer = self._renderer_instance(renderer, 'server' if comm is None else 'default')
         kwargs = {'doc': doc, 'root': root} if backend == 'bokeh' else {}
         if comm:
             kwargs['comm'] = comm
@@ -75,10 +155,19 @@ class HoloViews(PaneBase):
         """
         Should return the Bokeh model to be rendered.
         """
-        plot = self._render(doc, comm, root)
-        child_pane = Pane(plot.state, _temporary=True)
-        model = child_pane._get_model(doc, root, parent, comm)
         widgets = self.widgets_from_dimensions(self.object, self.widgets)
+        key = None if widgets else self._plot_key(comm)
+        cached = None if key is None else _plot_cache.get(key)
+        if cached is not None and cached[0] is self.object:
+            plot, state = None, models_from_spec(cached[1])
+        else:
+            plot = self._render(doc, comm, root)
+            state = plot.state
+            if key is not None and not any(getattr(p, 'streams', None) for p in
+                                           plot.traverse(lambda x: x)):
+                _plot_cache[key] = (self.object, model_spec(state))
+        child_pane = Pane(state, _temporary=True)
+        model = child_pane._get_model(doc, root, parent, comm)
         layout = model
         if widgets:
             self.widget_box.objects = widgets
@@ -86,16 +175,47 @@ class HoloViews(PaneBase):
                 layout = _BkRow()
                 wbox = self.widget_box._get_model(doc, root, parent, comm)
                 layout.children = [model, wbox]
-            self._link_widgets(widgets, child_pane, layout, plot, comm)
+            self._link_widgets(widgets, child_pane, model, layout, plot, doc, comm)
         self._link_object(layout, doc, root, parent, comm)
-        self._plots[layout.ref['id']] = plot
+        if plot is not None:
+            self._plots[layout.ref['id']] = plot
         return layout
 
-    def _link_widgets(self, widgets, pane, model, plot, comm):
+    def _link_widgets(self, widgets, pane, child, model, plot, doc, comm):
+        bokeh = plot.renderer.backend == 'bokeh'
+        if self.cache_size and not bokeh and isinstance(pane, DivPaneBase):
+            # Frames are shared between sessions rendering the same object
+            if (self._frames is None or self._frames[0] is not self.object or
+                self._frames[1].max_items != self.cache_size):
+                self._frames = (self.object, LRUCache(self.cache_size))
+            frames = self._frames[1]
+        else:
+            frames = None
+        current = []
+
+        def schedule(callback):
+            if comm:
+                from tornado.ioloop import IOLoop
+                IOLoop.current().add_callback(callback)
+            else:
+                doc.add_next_tick_callback(callback)
+
+        def render_frame(key):
+            """
+            Renders a frame to the properties of the Div model without
+            modifying the displayed pane.
+            """
+            plot.update(key)
+            params = {k: v for k, v in pane.get_param_values()
+                      if k not in ('object', 'name')}
+            props = type(pane)(plot.state, **params)._get_properties()
+            frames[key] = props
+            return props
+
         def update_plot(change):
-            from holoviews.plotting.bokeh.plot import BokehPlot
             key = tuple(w.value for w in widgets)
-            if isinstance(plot, BokehPlot):
+            current[:] = [key]
+            if bokeh:
                 if comm:
                     plot.update(key)
                     plot.push()
@@ -103,14 +223,72 @@ class HoloViews(PaneBase):
                     def update_plot():
                         plot.update(key)
                     plot.document.add_next_tick_callback(update_plot)
-            else:
+            elif frames is None:
                 plot.update(key)
                 pane.object = plot.state
+            else:
+                props = frames.get(key)
+                if props is None:
+                    props = render_frame(key)
+                div = child if isinstance(child, _BkDiv) else child.select_one({'type': _BkDiv})
+                self._update_models(doc, [(div, props)], comm)
+            if self.prefetch and (frames is not None or self._is_dynamic()):
+                neighbors = self._neighbor_keys(widgets, key, self.prefetch)
+                schedule(partial(prefetch, key, neighbors))
+
+        def prefetch(key, neighbors):
+            """
+            Precomputes the next neighboring frame and schedules the
+            remaining ones, so each event loop callback only renders
+            a single frame.
+            """
+            # Abort if the widgets have moved on
+            if current != [key] or not neighbors:
+                return
+            neighbor = neighbors.pop(0)
+            if frames is None:
+                self.object[neighbor]
+            elif neighbor not in frames:
+                render_frame(neighbor)
+            if neighbors:
+                schedule(partial(prefetch, key, neighbors))
 
         for w in widgets:
             watcher = w.param.watch(update_plot, 'value')
             self._callbacks[model.ref['id']].append(watcher)
 
+    def _is_dynamic(self):
+        """
+        Whether the object is a DynamicMap, which caches the frames
+        it has computed itself.
+        """
+        if 'holoviews' not in sys.modules:
+            return False
+        from holoviews import DynamicMap
+        return isinstance(self.object, DynamicMap)
+
+    @classmethod
+    def _neighbor_keys(cls, widgets, key, n):
+        """
+        Returns the keys obtained by moving each widget with a discrete
+        set of options up to n positions from the supplied key, nearest
+        positions first.
+        """
+        neighbors = []
+        for offset in range(1, n+1):
+            for i, widget in enumerate(widgets):
+                options = getattr(widget, 'options', None)
+                if not options:
+                    continue
+                values = list(options.values()) if isinstance(options, dict) else options
+                if key[i] not in values:
+                    continue
+                index = values.index(key[i])
+                for j in (index+offset, index-offset):
+                    if 0 <= j < len(values):
+                        neighbors.append(key[:i] + (values[j],) + key[i+1:])
+        return neighbors
+
     @classmethod
     def widgets_from_dimensions(cls, object, widget_types={}):
         from holoviews.core import Dimension
@@ -171,6 +349,49 @@ def is_bokeh_element_plot(plot):
             and not isinstance(plot, GenericOverlayPlot))
 
 
+def _link_sources(plot):
+    """
+    Returns the objects on a HoloViews ElementPlot which may act as
+    the source or target of a Link.
+    """
+    sources = getattr(plot, 'link_sources', None)
+    if sources is None:
+        sources = [plot.hmap.last]
+    return sources
+
+
+def _plot_index(plots):
+    """
+    Builds an index of the supplied (plot, root_plot) pairs keyed by
+    the id and the plot id of each of the plot's link sources.
+    """
+    index = defaultdict(list)
+    for plot, root_plot in plots:
+        for source in _link_sources(plot):
+            keys = [('id', id(source))]
+            plot_id = getattr(source, '_plot_id', None)
+            if plot_id is not None:
+                keys.append(('plot_id', plot_id))
+            for key in keys:
+                entries = index[key]
+                if not any(p is plot for p, _ in entries):
+                    entries.append((plot, root_plot))
+    return index
+
+
+def _lookup(index, obj):
+    keys = [('id', id(obj))]
+    plot_id = getattr(obj, '_plot_id', None)
+    if plot_id is not None:
+        keys.append(('plot_id', plot_id))
+    found = []
+    for key in keys:
+        for entry in index.get(key, []):
+            if not any(p is entry[0] for p, _ in found):
+                found.append(entry)
+    return found
+
+
 def find_links(root_view, root_model):
     """
     Traverses the supplied Viewable searching for Links between any
@@ -179,29 +400,34 @@ def find_links(root_view, root_model):
     if not isinstance(root_view, Layout):
         return
 
-    from holoviews.plotting.links import Link
-    from holoviews.plotting.bokeh.callbacks import LinkCallback
+    try:
+        from holoviews.plotting.links import Link
+    except ImportError:
+        return
+    if not Link.registry:
+        return
 
     hv_views = root_view.select(HoloViews)
     root_plots = [plot for view in hv_views for plot in view._plots.values()
                   if plot.root is root_model]
     plots = [(plot, root_plot) for root_plot in root_plots
              for plot in root_plot.traverse(lambda x: x, [is_bokeh_element_plot])]
-    potentials = [(LinkCallback.find_link(plot), root_plot)
-                  for plot, root_plot in plots]
-    source_links = [p for p in potentials if p[0] is not None]
+    if not plots:
+        return
+
+    index = _plot_index(plots)
     found = []
-    for (plot, links), root_plot in source_links:
-        for link in links:
-            if link.target is None:
-                # If link has no target don't look further
-                found.append((link, plot, None))
-                continue
-            potentials = [LinkCallback.find_link(plot, link) for plot, inner_root in plots
-                          if inner_root is not root_plot]
-            tgt_links = [p for p in potentials if p is not None]
-            if tgt_links:
-                found.append((link, plot, tgt_links[0][0]))
+    for source, links in list(Link.registry.items()):
+        for plot, root_plot in _lookup(index, source):
+            for link in links:
+                if link.target is None:
+                    # If link has no target don't look further
+                    found.append((link, plot, None))
+                    continue
+                tgt_plots = [tgt for tgt, inner_root in _lookup(index, link.target)
+                             if inner_root is not root_plot]
+                if tgt_plots:
+                    found.append((link, plot, tgt_plots[0]))
 
     callbacks = []
     for link, src_plot, tgt_plot in found:
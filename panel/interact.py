@@ -10,8 +10,15 @@ Distributed under the terms of the Modified BSD License.
 """
 from __future__ import absolute_import
 
+import io
+import json
+import re
 import types
+import weakref
+from functools import reduce
+from itertools import product
 from numbers import Real, Integral
+from operator import mul
 from collections import Iterable, Mapping, OrderedDict
 from inspect import getcallargs
 
@@ -28,13 +35,49 @@ except ImportError:
 empty = Parameter.empty
 
 import param
+import numpy as np
+
+from bokeh.core.json_encoder import serialize_json
+from bokeh.document import Document
+from bokeh.embed import file_html
+from bokeh.model import Model
+from bokeh.models import CustomJS
+from bokeh.resources import CDN
 
 from .layout import WidgetBox, Layout, Column
 from .pane import PaneBase, Pane
-from .util import basestring, as_unicode, push
+from .util import LRUCache, LatestCall, basestring, as_unicode, hashable
+from .viewable import Viewable
 from .widgets import (Checkbox, TextInput, Widget, IntSlider, FloatSlider,
                       Select, DiscreteSlider, Button)
 
+_missing = object()
+
+
+def _serialize_output(model):
+    """
+    Serializes a model and all the models it references, replacing
+    the model ids with their order in a depth first traversal so that
+    identical outputs rendered to distinct models serialize to the
+    same JSON. Returns the canonical JSON and the serialized size.
+    """
+    jsons = {m.ref['id']: serialize_json(m.to_json(False))
+             for m in model.references()}
+    order, stack = [], [model.ref['id']]
+    while stack:
+        ref = stack.pop()
+        if ref in order:
+            continue
+        order.append(ref)
+        refs = re.findall(r'"id":"([^"]+)"', jsons[ref])
+        stack += [r for r in reversed(refs) if r in jsons and r not in order]
+    order += sorted(set(jsons) - set(order))
+    index = {ref: i for i, ref in enumerate(order)}
+    pattern = re.compile('"(%s)"' % '|'.join(re.escape(ref) for ref in order))
+    canonical = '\n'.join(pattern.sub(lambda m: '"#%d"' % index[m.group(1)], jsons[ref])
+                           for ref in order)
+    return canonical, sum(len(j) for j in jsons.values())
+
 
 def _get_min_max_value(min, max, value=None, step=None):
     """Return min, max, value given input values with possible None."""
@@ -115,6 +158,26 @@ class interactive(PaneBase):
 
     manual_name = param.String(default='Run Interact')
 
+    executor = param.Parameter(default=None, doc="""
+        An optional executor, e.g. a concurrent.futures.ThreadPoolExecutor
+        or ProcessPoolExecutor, used to evaluate the function off the
+        event loop. Only the latest requested call is kept in flight
+        and results for outdated widget states are discarded.""")
+
+    cache_size = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of function results to memoize, keyed by the widget
+        values. The cache is shared by all interactive instances
+        wrapping the same function, so the function should be pure
+        in its arguments. Results which are bokeh models or panel
+        objects are not cached, since they cannot be shared between
+        documents. Disabled if zero.""")
+
+    cache_bytes = param.Integer(default=None, bounds=(0, None), doc="""
+        Optional bound on the estimated memory held by the cache.""")
+
+    # Result caches shared between instances wrapping the same function
+    _caches = weakref.WeakKeyDictionary()
+
     def __init__(self, object, params={}, **kwargs):
         super(interactive, self).__init__(object, **params)
 
@@ -134,7 +197,7 @@ class interactive(PaneBase):
         if self.manual_update:
             widgets.append(('manual', Button(name=self.manual_name)))
         self._widgets = OrderedDict(widgets)
-        self._pane = Pane(self.object(**self.kwargs), name=self.name,
+        self._pane = Pane(self._evaluate(self.kwargs), name=self.name,
                           _temporary=True)
         self._widget_box = WidgetBox(*(widget for _, widget in widgets
                                        if isinstance(widget, Widget)))
@@ -145,6 +208,49 @@ class interactive(PaneBase):
         return {k: widget.value for k, widget in self._widgets.items()
                 if k != 'manual'}
 
+    @property
+    def cache(self):
+        """
+        The LRUCache of function results or None if caching is disabled.
+        """
+        if not self.cache_size:
+            return None
+        cache = self._caches.get(self.object)
+        if cache is None:
+            cache = LRUCache(self.cache_size, self.cache_bytes)
+            self._caches[self.object] = cache
+        return cache
+
+    @staticmethod
+    def _cache_key(kwargs):
+        key = tuple(sorted((k, hashable(v)) for k, v in kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _cacheable(result):
+        """
+        Whether a result may be cached. Bokeh models may only belong
+        to a single Document and panel objects are cleaned up by the
+        session displaying them, so neither is shared between sessions.
+        """
+        return not isinstance(result, (Model, Viewable))
+
+    def _evaluate(self, kwargs):
+        cache = self.cache
+        key = None if cache is None else self._cache_key(kwargs)
+        if key is not None:
+            result = cache.get(key, _missing)
+            if result is not _missing:
+                return result
+        result = self.object(**kwargs)
+        if key is not None and self._cacheable(result):
+            cache[key] = result
+        return result
+
     def signature(self):
         return signature(self.object)
 
@@ -178,61 +284,235 @@ class interactive(PaneBase):
         else:
             widgets = self._widgets.items()
 
-        for name, widget in widgets:
-            def update_pane(change, history=history):
-                # Try updating existing pane
-                old_model = history[0]
-                new_object = self.object(**self.kwargs)
-                pane_type = self.get_pane_type(new_object)
-                if type(self._pane) is pane_type:
-                    index = layout.children.index(old_model)
-                    if isinstance(new_object, PaneBase):
-                        new_params = {k: v for k, v in new_object.get_param_values()
-                                      if k != 'name'}
-                        self._pane.set_param(**new_params)
-                        new_object._cleanup(None, new_object._temporary)
-                    else:
-                        self._pane.object = new_object
-
-                    # If model has changed update history and remap callbacks
-                    def update_state():
-                        if old_model is layout.children[index]:
-                            return
-                        new_model = layout.children[index]
-                        history[0] = new_model
-
-                    if comm:
-                        update_state()
-                    else:
-                        doc.add_next_tick_callback(update_state)
-
-                    return
-
-                # Replace pane entirely
-                self._pane._cleanup(old_model, self._pane._temporary)
-                self._pane = Pane(new_object, _temporary=True)
-                new_model = self._pane._get_model(doc, root, parent, comm)
-                def update_models():
-                    if old_model is new_model: return
-                    index = layout.children.index(old_model)
-                    layout.children[index] = new_model
+        def update_pane(new_object, history=history):
+            # Try updating existing pane
+            old_model = history[0]
+            pane_type = self.get_pane_type(new_object)
+            if type(self._pane) is pane_type:
+                index = layout.children.index(old_model)
+                if isinstance(new_object, PaneBase):
+                    new_params = {k: v for k, v in new_object.get_param_values()
+                                  if k != 'name'}
+                    self._pane.set_param(**new_params)
+                    new_object._cleanup(None, new_object._temporary)
+                else:
+                    self._pane.object = new_object
+
+                # If model has changed update history and remap callbacks
+                def update_state():
+                    if old_model is layout.children[index]:
+                        return
+                    new_model = layout.children[index]
                     history[0] = new_model
 
                 if comm:
-                    update_models()
-                    push(doc, comm)
+                    update_state()
                 else:
-                    doc.add_next_tick_callback(update_models)
+                    doc.add_next_tick_callback(update_state)
+
+                return
+
+            # Replace pane entirely
+            self._pane._cleanup(old_model, self._pane._temporary)
+            self._pane = Pane(new_object, _temporary=True)
+            new_model = self._pane._get_model(doc, root, parent, comm)
+            def update_models():
+                if old_model is new_model: return
+                index = layout.children.index(old_model)
+                layout.children[index] = new_model
+                history[0] = new_model
+
+            if comm:
+                update_models()
+                self._push(doc, comm)
+            else:
+                doc.add_next_tick_callback(update_models)
 
+        if self.executor is None:
+            def evaluate():
+                update_pane(self._evaluate(self.kwargs))
+        else:
+            if comm:
+                from tornado.ioloop import IOLoop
+                schedule = IOLoop.current().add_callback
+            else:
+                schedule = doc.add_next_tick_callback
+            requested = [None]
+            def resolve(new_object):
+                cache, key = self.cache, requested[0]
+                if (cache is not None and key is not None and
+                    self._cacheable(new_object)):
+                    cache[key] = new_object
+                update_pane(new_object)
+            def error(e):
+                self.param.warning('Evaluating %s raised %s: %s' %
+                                   (self.object.__name__, type(e).__name__, e))
+            call = LatestCall(self.executor, resolve, schedule, error)
+            def evaluate():
+                kwargs = self.kwargs
+                cache = self.cache
+                key = None if cache is None else self._cache_key(kwargs)
+                cached = _missing if key is None else cache.get(key, _missing)
+                if cached is not _missing:
+                    requested[0] = None
+                    call.set_result(cached)
+                else:
+                    requested[0] = key
+                    call(self.object, **kwargs)
+
+        # Changes to multiple widgets are coalesced into a single
+        # evaluation, within a hold or, on the server, within one tick
+        ref = layout.ref['id']
+        scheduled = []
+        def flush():
+            del scheduled[:]
+            if ref in self._callbacks:
+                evaluate()
+
+        def update(*events):
+            if comm:
+                flush()
+            elif not scheduled:
+                scheduled.append(doc.add_next_tick_callback(flush))
+        update = self._holdable(update)
+
+        for name, widget in widgets:
             pname = 'clicks' if name == 'manual' else 'value'
-            watcher = widget.param.watch(update_pane, pname)
-            self._callbacks[layout.ref['id']].append(watcher)
+            watcher = widget.param.watch(update, pname)
+            self._callbacks[ref].append(watcher)
 
     def _cleanup(self, model=None, final=False):
         self.layout._cleanup(model, final)
         self._pane._cleanup(model.children[1], final)
         super(interactive, self)._cleanup(model, final)
 
+    def embed(self, max_states=1000, max_bytes=None):
+        """
+        Returns a bokeh model embedding the output for every
+        combination of widget values, which switches between the
+        precomputed outputs in the browser without a Python process.
+        All widgets must take a discrete set of values, e.g.
+        DiscreteSlider, Select and Checkbox widgets.
+
+        max_states: int
+            Maximum number of widget combinations to evaluate. If
+            exceeded the options of the widgets with the most options
+            are subsampled and the output snaps to the nearest
+            embedded state.
+
+        max_bytes: int (optional)
+            Maximum estimated size of the serialized outputs, raises
+            a ValueError if exceeded. Identical outputs are only
+            embedded once.
+        """
+        doc = Document()
+        model = self.layout._get_model(doc)
+        self.layout._cleanup(model)
+        states, widget_models = [], []
+        for name, widget in self._widgets.items():
+            if not isinstance(widget, Widget) or name == 'manual':
+                continue
+            wmodel = widget._get_model(doc, model)
+            widget._cleanup(wmodel)
+            state = widget._get_embed_state(wmodel)
+            if state is None:
+                raise ValueError('Cannot embed %s widget %r, only widgets '
+                                 'which take a discrete set of values may '
+                                 'be embedded.' % (type(widget).__name__, name))
+            states.append((name,) + state)
+            widget_models += wmodel.children
+        box = model.children[0]
+        box.children = widget_models
+
+        # Subsample the widgets with the most options to fit max_states
+        counts = [len(state[3]) for state in states]
+        while reduce(mul, counts, 1) > max_states and max(counts) > 1:
+            counts[counts.index(max(counts))] -= 1
+        sampled = [sorted(set(int(round(i)) for i in np.linspace(0, len(s[3])-1, n)))
+                   for s, n in zip(states, counts)]
+
+        # Evaluate each state and embed each distinct output once,
+        # identifying outputs by their serialized models
+        kwargs = self.kwargs
+        outputs, rendered, models, lookup = {}, {}, [], []
+        size = 0
+        for indices in product(*sampled):
+            for (name, _, _, values, _, _), i in zip(states, indices):
+                kwargs[name] = values[i]
+            obj = self._evaluate(kwargs)
+            try:
+                obj_key = (type(obj), obj)
+                hash(obj_key)
+            except TypeError:
+                obj_key = None
+            if obj_key is not None and obj_key in rendered:
+                lookup.append(rendered[obj_key][0])
+                continue
+            pane = Pane(obj, _temporary=True)
+            out = pane._get_model(doc, model)
+            pane._cleanup(out, pane._temporary)
+            key, nbytes = _serialize_output(out)
+            if key not in outputs:
+                size += nbytes
+                if max_bytes is not None and size > max_bytes:
+                    raise ValueError('Embedded outputs exceed the size budget '
+                                     'of %d bytes, reduce max_states or '
+                                     'increase max_bytes.' % max_bytes)
+                outputs[key] = len(models)
+                models.append(out)
+            if obj_key is not None:
+                # Keep a reference to the object so its key stays valid
+                rendered[obj_key] = (outputs[key], obj)
+            lookup.append(outputs[key])
+
+        # Display the state matching the current widget values
+        flat = 0
+        for (name, _, _, values, _, _), indices in zip(states, sampled):
+            value = values.index(self.kwargs[name])
+            flat = flat * len(indices) + min(
+                range(len(indices)), key=lambda i: abs(indices[i]-value))
+        model.children = [model.children[0], models[lookup[flat]]]
+
+        args = {'target': model, 'states': models}
+        code = []
+        for i, (_, wmodel, _, _, body, extra) in enumerate(states):
+            names = ['widget%d' % i] + ['widget%d_%s' % (i, k) for k in extra]
+            args.update(zip(names, [wmodel] + list(extra.values())))
+            code.append('indices.push(nearest(%s, (function(%s) {\n%s\n})(%s)));'
+                        % (json.dumps(sampled[i]), ', '.join(['model']+list(extra)),
+                           body, ', '.join(names)))
+        callback = CustomJS(args=args, code=_EMBED_JS % dict(
+            shape=json.dumps([len(s) for s in sampled]),
+            lookup=json.dumps(lookup), indices='\n'.join(code)))
+        for _, wmodel, prop, _, _, _ in states:
+            wmodel.js_on_change(prop, callback)
+
+        # Drop python callbacks which cannot run in a static page
+        for m in model.references().union(*(o.references() for o in models)):
+            m._callbacks = {}
+        self._preprocess(model)
+        return model
+
+    def save(self, filename, title=None, resources=CDN, max_states=1000,
+             max_bytes=None):
+        """
+        Saves a standalone HTML file embedding the output for every
+        combination of widget values, see interactive.embed.
+
+        filename: str
+            Path of the HTML file to write
+
+        title: str (optional)
+            Title of the HTML document
+
+        resources: bokeh.resources.Resources
+            Whether to load BokehJS from CDN or inline it
+        """
+        model = self.embed(max_states, max_bytes)
+        html = file_html(model, resources, title or self.name)
+        with io.open(filename, mode='w', encoding='utf-8') as f:
+            f.write(as_unicode(html))
+
     def widgets_from_abbreviations(self, seq):
         """Given a sequence of (name, abbrev, default) tuples, return a sequence of Widgets."""
         result = []
@@ -345,10 +625,33 @@ class interactive(PaneBase):
     # Return a factory for interactive functions
     @classmethod
     def factory(cls):
-        options = dict(manual_update=False, manual_name="Run Interact")
+        options = dict(manual_update=False, manual_name="Run Interact",
+                       executor=None, cache_size=0, cache_bytes=None)
         return _InteractFactory(cls, options)
 
 
+_EMBED_JS = """
+function nearest(sampled, index) {
+  var best = 0;
+  for (var i = 1; i < sampled.length; i++) {
+    if (Math.abs(sampled[i] - index) < Math.abs(sampled[best] - index))
+      best = i;
+  }
+  return best;
+}
+var shape = %(shape)s;
+var lookup = %(lookup)s;
+var indices = [];
+%(indices)s
+var flat = 0;
+for (var i = 0; i < indices.length; i++)
+  flat = flat * shape[i] + indices[i];
+var state = states[lookup[flat]];
+if (target.children[1] !== state)
+  target.children = [target.children[0], state];
+"""
+
+
 class _InteractFactory(object):
     """
     Factory for instances of :class:`interactive`.
@@ -4,14 +4,19 @@ in flexible ways to build complex dashboards.
 """
 from __future__ import absolute_import
 
+import os
+import re
+import time
+from functools import partial
+
 import param
 
+from bokeh.core.properties import Int
 from bokeh.layouts import (Column as BkColumn, Row as BkRow,
                            WidgetBox as BkWidgetBox, Spacer as BkSpacer)
 from bokeh.models.widgets import Tabs as BkTabs, Panel as BkPanel
 
 from .pane import Pane, PaneBase
-from .util import push
 from .viewable import Reactive
 
 
@@ -21,7 +26,13 @@ class Layout(Reactive):
     """
 
     objects = param.List(default=[], doc="""
-        The list of child objects that make up the layout.""")
+        The list of child objects that make up the layout. Panes
+        created with a key, e.g. Pane(obj, key='a'), are matched by
+        that key when the objects are replaced. If the previously
+        rendered pane with the same key wraps the same object with
+        matching parameters, the old pane instance is kept in place
+        of the new one, together with its rendered model, so any
+        reference to the new pane is detached from the layout.""")
 
     _bokeh_model = None
 
@@ -29,6 +40,10 @@ class Layout(Reactive):
 
     _rename = {'objects': 'children'}
 
+    # Splice (index, n_removed, n_inserted) describing the change to the
+    # objects currently being applied by one of the list methods
+    _pending_splice = None
+
     def __init__(self, *objects, **params):
         objects = [Pane(pane) for pane in objects]
         super(Layout, self).__init__(objects=objects, **params)
@@ -45,20 +60,18 @@ class Layout(Reactive):
             events = {event.name: event for event in events}
             if 'objects' in msg:
                 old = events['objects'].old
-                msg['objects'] = self._get_objects(model, old, doc, root, comm)
+                children = None
+                if self._pending_splice is not None:
+                    children = self._splice_objects(model, old, self._pending_splice,
+                                                    doc, root, comm)
+                if children is None:
+                    children = self._get_objects(model, old, doc, root, comm)
+                msg['objects'] = children
             msg = self._process_param_change(msg)
-
-            def update_model():
-                model.update(**msg)
-
-            if comm:
-                update_model()
-                push(doc, comm)
-            else:
-                doc.add_next_tick_callback(update_model)
+            self._update_models(doc, [(model, msg)], comm)
 
         ref = model.ref['id']
-        watcher = self.param.watch(set_value, params)
+        watcher = self.param.watch(self._holdable(set_value), params)
         self._callbacks[ref].append(watcher)
 
     def _cleanup(self, model=None, final=False):
@@ -87,27 +100,129 @@ class Layout(Reactive):
             objects += obj.select(selector)
         return objects
 
+    @staticmethod
+    def _object_key(obj):
+        """
+        Returns the key used to match an object against the previously
+        rendered objects, which is either the user supplied key or the
+        identity of the object.
+        """
+        if obj._key is None:
+            return ('id', id(obj))
+        return ('key', obj._key)
+
+    def _old_models(self, old_objects, old_children):
+        """
+        Returns a mapping from object key to the old object and its
+        rendered child model.
+        """
+        return {self._object_key(obj): (obj, child)
+                for obj, child in zip(old_objects, old_children)}
+
+    @staticmethod
+    def _params_match(old, new):
+        """
+        Whether all parameters of the new pane other than the object
+        match those of the old pane. Automatically generated names are
+        ignored.
+        """
+        auto_name = re.compile(r'%s\d{5}$' % type(new).__name__)
+        for name, value in new.param.get_param_values():
+            if name == 'object' or (name == 'name' and auto_name.match(value)):
+                continue
+            old_value = getattr(old, name)
+            try:
+                if old_value is not value and old_value != value:
+                    return False
+            except Exception:
+                return False
+        return True
+
+    def _reuse_model(self, pane, old_models):
+        """
+        Looks up a previously rendered model for the supplied pane
+        returning the pane to use and the model to reuse (or None). A
+        pane with a user supplied key reuses an existing pane with the
+        same key if both are of the same type, wrap the same object and
+        have matching parameters. In that case the old pane replaces
+        the new one in the objects, since its watchers are linked to
+        the reused model.
+        """
+        old = old_models.get(self._object_key(pane))
+        if old is None:
+            return pane, None
+        old_pane, old_child = old
+        if old_pane is pane:
+            return pane, old_child
+        elif (type(old_pane) is type(pane) and isinstance(pane, PaneBase)
+              and old_pane.object is pane.object
+              and self._params_match(old_pane, pane)):
+            return old_pane, old_child
+        return pane, None
+
+    def _cleanup_objects(self, old_objects, old_children, new_models):
+        """
+        Cleans up any old objects whose models are no longer in use.
+        """
+        new_ids = set(id(m) for m in new_models)
+        for pane, old_child in zip(old_objects, old_children):
+            if id(old_child) not in new_ids:
+                self._cleanup_child(pane, old_child)
+
+    def _cleanup_child(self, pane, child):
+        pane._cleanup(child)
+
+    def _get_child_model(self, pane, doc, root, model, comm=None):
+        """
+        Renders the model for a child object of the layout.
+        """
+        return pane._get_model(doc, root, model, comm)
+
     def _get_objects(self, model, old_objects, doc, root, comm=None):
         """
         Returns new child models for the layout while reusing unchanged
         models and cleaning up any dropped objects.
         """
         old_children = getattr(model, self._rename.get('objects', 'objects'))
+        old_models = self._old_models(old_objects, old_children)
         new_models = []
         for i, pane in enumerate(self.objects):
-            pane = Pane(pane, _temporary=True)
+            pane, child = self._reuse_model(Pane(pane, _temporary=True), old_models)
             self.objects[i] = pane
-            if pane in old_objects:
-                child = old_children[old_objects.index(pane)]
-            else:
-                child = pane._get_model(doc, root, model, comm)
+            if child is None:
+                child = self._get_child_model(pane, doc, root, model, comm)
             new_models.append(child)
-
-        for pane, old_child in zip(old_objects, old_children):
-            if old_child not in new_models:
-                pane._cleanup(old_child)
+        self._cleanup_objects(old_objects, old_children, new_models)
         return new_models
 
+    def _splice_objects(self, model, old_objects, splice, doc, root, comm=None):
+        """
+        Returns new child models for the layout by applying a splice
+        to the existing children, rendering only the inserted objects
+        and cleaning up the removed ones. Returns None if the existing
+        children do not correspond to the old objects and therefore
+        have to be reconciled in full.
+        """
+        index, n_removed, n_inserted = splice
+        old_children = getattr(model, self._rename.get('objects', 'objects'))
+        if len(old_children) != len(old_objects):
+            return None
+        removed = list(zip(old_objects[index:index+n_removed],
+                           old_children[index:index+n_removed]))
+        inserted = []
+        for pane in self.objects[index:index+n_inserted]:
+            reused = [c for p, c in removed if p is pane]
+            if reused:
+                child = reused[0]
+            else:
+                child = self._get_child_model(pane, doc, root, model, comm)
+            inserted.append(child)
+        inserted_ids = set(id(c) for c in inserted)
+        for pane, child in removed:
+            if id(child) not in inserted_ids:
+                self._cleanup_child(pane, child)
+        return old_children[:index] + inserted + old_children[index+n_removed:]
+
     def _get_model(self, doc, root=None, parent=None, comm=None):
         model = self._bokeh_model()
         root = model if root is None else root
@@ -123,27 +238,46 @@ class Layout(Reactive):
         self._link_params(model, params, doc, root, comm)
         return model
 
-    def __setitem__(self, index, pane):
+    def _splice(self, index, n_removed, inserted):
+        """
+        Replaces n_removed objects starting at the index with the
+        inserted objects. Linked models are updated by splicing their
+        children rather than reconciling all objects.
+        """
         new_objects = list(self.objects)
-        new_objects[index] = Pane(pane)
-        self.objects = new_objects
+        new_objects[index:index+n_removed] = inserted
+        self._pending_splice = (index, n_removed, len(inserted))
+        try:
+            self.objects = new_objects
+        finally:
+            self._pending_splice = None
+
+    def _normalize_index(self, index):
+        n = len(self.objects)
+        if index < -n or index >= n:
+            raise IndexError('%s index out of range' % type(self).__name__)
+        return index + n if index < 0 else index
+
+    def __setitem__(self, index, pane):
+        if isinstance(index, slice):
+            new_objects = list(self.objects)
+            new_objects[index] = [Pane(p) for p in pane]
+            self.objects = new_objects
+            return
+        self._splice(self._normalize_index(index), 1, [Pane(pane)])
 
     def append(self, pane):
-        new_objects = list(self.objects)
-        new_objects.append(Pane(pane))
-        self.objects = new_objects
+        self._splice(len(self.objects), 0, [Pane(pane)])
 
     def insert(self, index, pane):
-        new_objects = list(self.objects)
-        new_objects.insert(index, Pane(pane))
-        self.objects = new_objects
+        n = len(self.objects)
+        index = max(0, index + n) if index < 0 else min(index, n)
+        self._splice(index, 0, [Pane(pane)])
 
     def pop(self, index):
-        new_objects = list(self.objects)
-        if index in new_objects:
-            index = new_objects.index(index)
-        new_objects.pop(index)
-        self.objects = new_objects
+        if index in self.objects:
+            index = self.objects.index(index)
+        self._splice(self._normalize_index(index), 1, [])
 
 
 class Row(Layout):
@@ -162,6 +296,166 @@ class Column(Layout):
     _bokeh_model = BkColumn
 
 
+class VirtualBox(BkColumn):
+    """
+    A bokeh Column which reports the position of the browser viewport
+    relative to the top of the column.
+    """
+
+    __implementation__ = os.path.join(os.path.dirname(__file__), 'models', 'virtual_box.ts')
+
+    item_height = Int(default=100)
+
+    scroll_top = Int(default=0)
+
+    viewport_height = Int(default=0)
+
+
+class VirtualColumn(Column):
+    """
+    VirtualColumn is a vertical layout which keeps the full list of
+    objects but only renders the window of objects near the browser
+    viewport. Objects outside the window are represented by spacers
+    sized using the estimated item_height and their models are built
+    and cleaned up as the window moves.
+    """
+
+    item_height = param.Integer(default=100, bounds=(1, None), doc="""
+        Estimated height of each object in pixels, used to map the
+        viewport onto the window of rendered objects.""")
+
+    overscan = param.Integer(default=5, bounds=(0, None), doc="""
+        Number of objects rendered above and below the viewport.""")
+
+    scroll_top = param.Integer(default=0, bounds=(0, None), doc="""
+        Initial offset of the browser viewport from the top of the
+        column. Each rendered model tracks the viewport reported by
+        its browser separately; setting this parameter moves the
+        viewport of all models.""")
+
+    viewport_height = param.Integer(default=1000, bounds=(0, None), doc="""
+        Initial height of the browser viewport in pixels, tracked per
+        model like the scroll_top.""")
+
+    _bokeh_model = VirtualBox
+
+    _window_params = ['item_height', 'overscan', 'scroll_top', 'viewport_height']
+
+    def __init__(self, *objects, **params):
+        super(VirtualColumn, self).__init__(*objects, **params)
+        # Mapping from model id to rendered window and children
+        self._windows = {}
+        # Mapping from model id to (scroll_top, viewport_height)
+        self._viewports = {}
+
+    def _process_param_change(self, msg):
+        msg = {k: v for k, v in msg.items() if k != 'overscan'}
+        return super(VirtualColumn, self)._process_param_change(msg)
+
+    def _viewport(self, ref):
+        return self._viewports.get(ref, (self.scroll_top, self.viewport_height))
+
+    def _window(self, ref=None):
+        """
+        Returns the start and end index of the objects rendered for
+        the viewport of the model with the supplied id.
+        """
+        scroll_top, viewport_height = self._viewport(ref)
+        first = scroll_top // self.item_height
+        last = (scroll_top + viewport_height) // self.item_height + 1
+        start = max(0, first - self.overscan)
+        end = min(len(self.objects), last + self.overscan)
+        return start, max(start, end)
+
+    def _get_objects(self, model, old_objects, doc, root, comm=None):
+        """
+        Returns the child models for the current window, reusing models
+        for objects which remain in the window and cleaning up those
+        which left it.
+        """
+        ref = model.ref['id']
+        _, old_rendered = self._windows.get(ref, (None, {}))
+        start, end = self._window(ref)
+        rendered, children = {}, []
+        for i in range(start, end):
+            pane = Pane(self.objects[i], _temporary=True)
+            self.objects[i] = pane
+            key = self._object_key(pane)
+            old_pane, child = old_rendered.get(key, (None, None))
+            if old_pane is not pane:
+                child = pane._get_model(doc, root, model, comm)
+            rendered[key] = (pane, child)
+            children.append(child)
+        for key, (pane, child) in old_rendered.items():
+            if rendered.get(key, (None, None))[1] is not child:
+                pane._cleanup(child)
+        self._windows[ref] = ((start, end), rendered)
+        n = len(self.objects)
+        top = BkSpacer(height=start*self.item_height)
+        bottom = BkSpacer(height=(n-end)*self.item_height)
+        return [top] + children + [bottom]
+
+    def _splice_objects(self, model, old_objects, splice, doc, root, comm=None):
+        # Only the window is rendered so the window is always recomputed
+        return None
+
+    def _get_model(self, doc, root=None, parent=None, comm=None):
+        model = super(VirtualColumn, self)._get_model(doc, root, parent, comm)
+        root = model if root is None else root
+        self._link_viewport(model, doc, root, comm)
+        watcher = self.param.watch(partial(self._window_param_change, model, doc, root, comm),
+                                   self._window_params)
+        self._callbacks[model.ref['id']].append(watcher)
+        return model
+
+    def _link_viewport(self, model, doc, root, comm=None):
+        """
+        Links the viewport properties of the model to the viewport
+        state of that model, so that each browser rendering the
+        column scrolls independently.
+        """
+        properties = ['scroll_top', 'viewport_height']
+        if comm is None:
+            def change(attr, old, new):
+                self._viewport_change(model, doc, root, comm, {attr: new})
+            for p in properties:
+                model.on_change(p, change)
+        else:
+            on_msg = partial(self._viewport_change, model, doc, root, comm)
+            client_comm = self._comm_manager.get_client_comm(on_msg=on_msg)
+            for p in properties:
+                customjs = self._get_customjs(p, client_comm, root.ref['id'])
+                model.js_on_change(p, customjs)
+
+    def _viewport_change(self, model, doc, root, comm, msg):
+        ref = model.ref['id']
+        scroll_top, viewport_height = self._viewport(ref)
+        self._viewports[ref] = (msg.get('scroll_top', scroll_top),
+                                msg.get('viewport_height', viewport_height))
+        self._update_window(model, doc, root, comm)
+
+    def _window_param_change(self, model, doc, root, comm, *events):
+        if any(e.name in ('scroll_top', 'viewport_height') for e in events):
+            self._viewports.pop(model.ref['id'], None)
+        self._update_window(model, doc, root, comm)
+
+    def _update_window(self, model, doc, root, comm):
+        ref = model.ref['id']
+        window, _ = self._windows.get(ref, (None, {}))
+        if self._window(ref) == window:
+            return
+        children = self._get_objects(model, self.objects, doc, root, comm)
+        self._update_models(doc, [(model, {'children': children})], comm)
+
+    def _cleanup(self, model=None, final=False):
+        super(Layout, self)._cleanup(model, final)
+        if model is not None:
+            self._viewports.pop(model.ref['id'], None)
+            _, rendered = self._windows.pop(model.ref['id'], (None, {}))
+            for pane, child in rendered.values():
+                pane._cleanup(child, final)
+
+
 class WidgetBox(Layout):
     """
     Box to group widgets.
@@ -173,28 +467,31 @@ class WidgetBox(Layout):
 
     _bokeh_model = BkWidgetBox
 
+    def _cleanup_child(self, pane, child):
+        pane._cleanup(child, pane._temporary)
+
+    def _splice_objects(self, model, old_objects, splice, doc, root, comm=None):
+        # Children are flattened so they cannot be mapped onto objects
+        return None
+
     def _get_objects(self, model, old_objects, doc, root, comm=None):
         """
         Returns new child models for the layout while reusing unchanged
         models and cleaning up any dropped objects.
         """
         old_children = getattr(model, self._rename.get('objects', 'objects'))
+        old_models = self._old_models(old_objects, old_children)
         new_models = []
         for i, pane in enumerate(self.objects):
-            pane = Pane(pane)
+            pane, child = self._reuse_model(Pane(pane), old_models)
             self.objects[i] = pane
-            if pane in old_objects:
-                child = old_children[old_objects.index(pane)]
-            else:
+            if child is None:
                 child = pane._get_model(doc, root, model, comm)
             if isinstance(child, BkWidgetBox):
                 new_models += child.children
             else:
                 new_models.append(child)
-
-        for pane, old_child in zip(old_objects, old_children):
-            if old_child not in new_models:
-                pane._cleanup(old_child, pane._temporary)
+        self._cleanup_objects(old_objects, old_children, new_models)
         return new_models
 
 
@@ -206,14 +503,29 @@ class Tabs(Layout):
     objects = param.List(default=[], doc="""
         The list of child objects that make up the tabs.""")
 
+    active = param.Integer(default=0, bounds=(0, None), doc="""
+        Index of the currently displayed tab.""")
+
     height = param.Integer(default=None, bounds=(0, None))
 
     width = param.Integer(default=None, bounds=(0, None))
 
+    lazy = param.Boolean(default=False, doc="""
+        Whether to defer rendering a tab until it is first activated.
+        Inactive tabs are rendered as empty placeholders.""")
+
+    idle_timeout = param.Number(default=None, bounds=(0, None), doc="""
+        Number of seconds after which the models of an inactive tab
+        are released and replaced by a placeholder when rendering
+        lazily. If None the models are kept indefinitely.""")
+
     _bokeh_model = BkTabs
 
     _rename = {'objects': 'tabs'}
 
+    # Parameters which are not mapped to the bokeh model
+    _lazy_params = ['lazy', 'idle_timeout']
+
     def __init__(self, *items, **params):
         objects = []
         for pane in items:
@@ -225,64 +537,131 @@ class Tabs(Layout):
                 name = None
             objects.append(Pane(pane, name=name))
         super(Tabs, self).__init__(*objects, **params)
+        self._placeholders = set()
+        self._inactive_since = {}
+        # Pending idle release callback per model
+        self._idle_callbacks = {}
+
+    def _process_param_change(self, msg):
+        msg = {k: v for k, v in msg.items() if k not in self._lazy_params}
+        return super(Tabs, self)._process_param_change(msg)
+
+    def _is_placeholder(self, model):
+        return id(model) in self._placeholders
+
+    def _placeholder(self):
+        placeholder = BkSpacer()
+        self._placeholders.add(id(placeholder))
+        return placeholder
+
+    def _cleanup_child(self, pane, child):
+        if self._is_placeholder(child.child):
+            self._placeholders.discard(id(child.child))
+        else:
+            pane._cleanup(child.child, pane._temporary)
+
+    def _get_child_model(self, pane, doc, root, model, comm=None):
+        active = self.objects[self.active] if self.active < len(self.objects) else None
+        if self.lazy and pane is not active:
+            child = self._placeholder()
+        else:
+            child = pane._get_model(doc, root, model, comm)
+        return BkPanel(title=pane.name, child=child)
 
-    def _get_objects(self, model, old_objects, doc, root, comm=None):
+    def _get_model(self, doc, root=None, parent=None, comm=None):
+        model = super(Tabs, self)._get_model(doc, root, parent, comm)
+        root = model if root is None else root
+        self._link_props(model, ['active'], doc, root, comm)
+        watcher = self.param.watch(partial(self._update_active, model, doc, root, comm),
+                                   'active')
+        self._callbacks[model.ref['id']].append(watcher)
+        return model
+
+    def _update_active(self, model, doc, root, comm, event):
         """
-        Returns new child models for the layout while reusing unchanged
-        models and cleaning up any dropped objects.
+        Renders the newly activated tab if it is a placeholder and
+        releases the models of tabs which have been idle for longer
+        than the idle_timeout.
         """
-        old_children = getattr(model, self._rename.get('objects', 'objects'))
-        new_models = []
-        for i, pane in enumerate(self.objects):
-            if pane in old_objects:
-                child = old_children[old_objects.index(pane)]
-            else:
+        if not self.lazy:
+            return
+        if event.old < len(self.objects):
+            self._inactive_since[id(self.objects[event.old])] = time.time()
+        updates = []
+        if event.new < len(self.objects):
+            pane, panel = self.objects[event.new], model.tabs[event.new]
+            self._inactive_since.pop(id(pane), None)
+            if self._is_placeholder(panel.child):
+                self._placeholders.discard(id(panel.child))
                 child = pane._get_model(doc, root, model, comm)
-                child = BkPanel(title=pane.name, child=child)
-            new_models.append(child)
-
-        for pane, old_child in zip(old_objects, old_children):
-            if old_child not in new_models:
-                pane._cleanup(old_child.child, pane._temporary)
+                updates.append((panel, {'child': child}))
+        self._release_idle(model, doc, comm, updates)
+        if self.idle_timeout is not None and comm is None:
+            self._schedule_release(model, doc)
 
-        return new_models
+    def _schedule_release(self, model, doc):
+        """
+        Schedules a single idle release for the model, replacing any
+        release which is still pending.
+        """
+        ref = model.ref['id']
+        self._cancel_release(ref, doc)
+        def release():
+            self._idle_callbacks.pop(ref, None)
+            self._release_idle(model, doc)
+        self._idle_callbacks[ref] = doc.add_timeout_callback(
+            release, self.idle_timeout*1000)
+
+    def _cancel_release(self, ref, doc):
+        callback = self._idle_callbacks.pop(ref, None)
+        if callback is not None and callback in doc.session_callbacks:
+            doc.remove_timeout_callback(callback)
+
+    def _release_idle(self, model, doc, comm=None, updates=None):
+        """
+        Replaces the models of all inactive tabs which have been idle
+        for longer than the idle_timeout with placeholders.
+        """
+        updates = [] if updates is None else updates
+        if self.idle_timeout is not None:
+            now = time.time()
+            for i, (pane, panel) in enumerate(zip(self.objects, model.tabs)):
+                if i == self.active or self._is_placeholder(panel.child):
+                    continue
+                if now - self._inactive_since.get(id(pane), now) >= self.idle_timeout:
+                    pane._cleanup(panel.child, pane._temporary)
+                    updates.append((panel, {'child': self._placeholder()}))
+        if updates:
+            self._update_models(doc, updates, comm)
 
     def __setitem__(self, index, pane):
         name = None
         if isinstance(pane, tuple):
             name, pane = pane
-        new_objects = list(self.objects)
-        new_objects[index] = Pane(pane, name=name)
-        self.objects = new_objects
+        super(Tabs, self).__setitem__(index, Pane(pane, name=name))
 
     def append(self, pane):
         name = None
         if isinstance(pane, tuple):
             name, pane = pane
-        new_objects = list(self.objects)
-        new_objects.append(Pane(pane, name=name))
-        self.objects = new_objects
+        super(Tabs, self).append(Pane(pane, name=name))
 
     def insert(self, index, pane):
         name = None
         if isinstance(pane, tuple):
             name, pane = pane
-        new_objects = list(self.objects)
-        new_objects.insert(index, Pane(pane))
-        self.objects = new_objects
-
-    def pop(self, index):
-        new_objects = list(self.objects)
-        if index in new_objects:
-            index = new_objects.index(index)
-        new_objects.pop(index)
-        self.objects = new_objects
+        super(Tabs, self).insert(index, Pane(pane, name=name))
 
     def _cleanup(self, model=None, final=False):
         super(Layout, self)._cleanup(model, final)
         if model is not None:
+            if model.document is not None:
+                self._cancel_release(model.ref['id'], model.document)
             for p, c in zip(self.objects, model.tabs):
-                p._cleanup(c.child, final)
+                if self._is_placeholder(c.child):
+                    self._placeholders.discard(id(c.child))
+                else:
+                    p._cleanup(c.child, final)
 
 
 class Spacer(Reactive):
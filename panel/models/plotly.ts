@@ -1,14 +1,34 @@
 import * as p from "core/properties"
 import {LayoutDOM, LayoutDOMView} from "models/layouts/layout_dom"
 
+function set_path(obj: any, path: string, value: any): void {
+  // Reinserts a value at the dotted path (e.g. 'marker.color') it
+  // was extracted from
+  const keys = path.split('.')
+  for (const key of keys.slice(0, -1)) {
+    if (obj[key] == null)
+      obj[key] = {}
+    obj = obj[key]
+  }
+  obj[keys[keys.length-1]] = value
+}
+
 export class PlotlyPlotView extends LayoutDOMView {
   model: PlotlyPlot
+  _connected: any[]
+  _patched: any[]
+  _pending: boolean
+  _replot: boolean
 
   initialize(options): void {
     super.initialize(options)
     const url = "https://cdn.plot.ly/plotly-latest.min.js"
 
     this._initialized = false;
+    this._connected = []
+    this._patched = []
+    this._pending = false
+    this._replot = false
     if (window.Plotly) {
       this._init()
     } else if ((window.Jupyter !== undefined) && (window.Jupyter.notebook !== undefined)) {
@@ -32,17 +52,63 @@ export class PlotlyPlotView extends LayoutDOMView {
   }
 
   get_width(): number {
-    return this.model.data.layout.width
+    return this.model.layout.width
   }
 
   get_height(): number {
-    return this.model.data.layout.height
+    return this.model.layout.height
   }
 
   _init(): void {
     this._plot()
     this._initialized = true
-    this.connect(this.model.properties.data.change, this._plot)
+    this.connect(this.model.properties.data.change, () => this._schedule_plot(true))
+    this.connect(this.model.properties.layout.change, () => this._schedule_plot(false))
+    this.connect(this.model.properties.data_sources.change, this._connect_sources)
+    this._connect_sources()
+  }
+
+  _connect_sources(): void {
+    for (const cds of this.model.data_sources) {
+      if (this._connected.indexOf(cds) >= 0)
+        continue
+      this._connected.push(cds)
+      this.connect(cds.properties.data.change, () => this._schedule_plot(true))
+      this.connect(cds.streaming, () => this._schedule_plot(true))
+      this.connect(cds.patching, () => {
+        // Patches modify arrays in place, which Plotly.react would
+        // not detect, so the arrays are copied on the next render
+        if (this._patched.indexOf(cds) < 0)
+          this._patched.push(cds)
+        this._schedule_plot(true)
+      })
+    }
+  }
+
+  _schedule_plot(replot: boolean): void {
+    // Coalesce data, layout, stream and patch events into a single
+    // render, which only reinserts the trace data if an event other
+    // than a layout change requires it
+    if (replot)
+      this._replot = true
+    if (this._pending)
+      return
+    this._pending = true
+    window.requestAnimationFrame(() => {
+      this._pending = false
+      const replot = this._replot
+      this._replot = false
+      if (replot)
+        this._plot()
+      else
+        this._relayout()
+    })
+  }
+
+  _relayout(): void {
+    // Only the layout changed so the trace data does not have to be
+    // reinserted from the data sources
+    Plotly.react(this.el, this.model.data, this.model.layout)
   }
 
   render(): void {
@@ -51,12 +117,15 @@ export class PlotlyPlotView extends LayoutDOMView {
   }
 
   _plot(): void {
-    for (const i = 0; i < this.model.data.data.length; i++) {
-      const trace = this.model.data.data[i]
+    for (const i = 0; i < this.model.data.length; i++) {
+      const trace = this.model.data[i]
       const cds = this.model.data_sources[i]
+      const patched = this._patched.indexOf(cds) >= 0
       for (const column of cds.columns()) {
         const shape = cds._shapes[column]
         let array = cds.get_array(column)
+        if (patched)
+          array = array.slice()
         if (shape.length > 1) {
           const arrays = []
           for (const s = 0; s < shape[0]; s++) {
@@ -64,10 +133,11 @@ export class PlotlyPlotView extends LayoutDOMView {
           }
           array = arrays
         }
-        trace[column] = array
+        set_path(trace, column, array)
       }
     }
-    Plotly.react(this.el, this.model.data.data, this.model.data.layout)
+    this._patched = []
+    Plotly.react(this.el, this.model.data, this.model.layout)
   }
 }
 
@@ -91,8 +161,9 @@ export class PlotlyPlot extends LayoutDOM {
     this.prototype.default_view = PlotlyPlotView
 
     this.define({
-      data: [ p.Any         ],
-      data_sources: [ p.Array  ],
+      data: [ p.Array ],
+      layout: [ p.Any ],
+      data_sources: [ p.Array ],
     })
   }
 }
@@ -63,14 +63,22 @@ export class VegaPlotView extends LayoutDOMView {
     const datasets = {}
     for (const ds in this.model.data_sources) {
       const cds = this.model.data_sources[ds];
+      const categories = this.model.categories[ds] || {}
       const data = []
       const columns = cds.columns()
       for (const i = 0; i < cds.data[columns[0]].length; i++) {
-        const item = {}
-        for (const column of columns) {
-          item[column] = cds.data[column][i]
+        data.push({})
+      }
+      for (const column of columns) {
+        const values = cds.data[column]
+        const cats = categories[column]
+        for (const i = 0; i < data.length; i++) {
+          // Decode dictionary-encoded string columns
+          if (cats === undefined)
+            data[i][column] = values[i]
+          else
+            data[i][column] = (values[i] < 0) ? null : cats[values[i]]
         }
-        data.push(item)
       }
       datasets[ds] = data;
     }
@@ -112,6 +120,7 @@ export class VegaPlot extends LayoutDOM {
     this.define({
       data: [ p.Any         ],
       data_sources: [ p.Any  ],
+      categories: [ p.Any, {} ],
     })
   }
 }
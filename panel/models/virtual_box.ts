@@ -0,0 +1,77 @@
+import * as p from "core/properties"
+import {Column, ColumnView} from "models/layouts/column"
+
+export class VirtualBoxView extends ColumnView {
+  model: VirtualBox
+  _pending: boolean
+
+  initialize(options): void {
+    super.initialize(options)
+    this._pending = false
+    this._on_scroll = this._on_scroll.bind(this)
+    window.addEventListener('scroll', this._on_scroll)
+    window.addEventListener('resize', this._on_scroll)
+  }
+
+  remove(): void {
+    window.removeEventListener('scroll', this._on_scroll)
+    window.removeEventListener('resize', this._on_scroll)
+    super.remove()
+  }
+
+  render(): void {
+    super.render()
+    this._on_scroll()
+  }
+
+  _on_scroll(): void {
+    if (this._pending)
+      return
+    this._pending = true
+    window.requestAnimationFrame(() => {
+      this._pending = false
+      this._update_viewport()
+    })
+  }
+
+  _update_viewport(): void {
+    // Position of the viewport relative to the top of the column
+    const rect = this.el.getBoundingClientRect()
+    const scroll_top = Math.round(Math.max(0, -rect.top))
+    const viewport_height = Math.round(window.innerHeight)
+    // Only sync changes which may move the rendered window
+    const threshold = this.model.item_height
+    if ((Math.abs(scroll_top - this.model.scroll_top) < threshold) &&
+        (viewport_height == this.model.viewport_height))
+      return
+    this.model.setv({scroll_top: scroll_top, viewport_height: viewport_height})
+  }
+}
+
+
+export namespace VirtualBox {
+  export interface Attrs extends Column.Attrs {}
+  export interface Props extends Column.Props {}
+}
+
+export interface VirtualBox extends VirtualBox.Attrs {}
+
+export class VirtualBox extends Column {
+  properties: VirtualBox.Props
+
+  constructor(attrs?: Partial<VirtualBox.Attrs>) {
+    super(attrs)
+  }
+
+  static initClass(): void {
+    this.prototype.type = "VirtualBox"
+    this.prototype.default_view = VirtualBoxView
+
+    this.define({
+      item_height:     [ p.Number, 100 ],
+      scroll_top:      [ p.Number, 0   ],
+      viewport_height: [ p.Number, 0   ],
+    })
+  }
+}
+VirtualBox.initClass()
@@ -7,6 +7,7 @@ from __future__ import absolute_import
 import os
 import sys
 import base64
+import inspect
 from io import BytesIO
 
 try:
@@ -20,7 +21,7 @@ import markdown
 from bokeh.layouts import Row as _BkRow, WidgetBox as _BkWidgetBox
 from bokeh.models import LayoutDOM, CustomJS, Widget as _BkWidget, Div as _BkDiv
 
-from .util import Div, basestring, push, remove_root
+from .util import Div, basestring, remove_root
 from .viewable import Reactive, Viewable
 
 
@@ -33,6 +34,22 @@ def Pane(obj, **kwargs):
     return PaneBase.get_pane_type(obj)(obj, **kwargs)
 
 
+class PaneMetaclass(param.parameterized.ParameterizedMetaclass):
+    """
+    Metaclass for Pane types which invalidates the Pane type cache
+    whenever a new Pane type is declared.
+    """
+
+    def __init__(mcs, name, bases, dict_):
+        super(PaneMetaclass, mcs).__init__(name, bases, dict_)
+        _pane_type_cache.clear()
+
+
+# Cache of resolved Pane types keyed by PaneBase._type_key
+_pane_type_cache = {}
+
+
+@param.parameterized.add_metaclass(PaneMetaclass)
 class PaneBase(Reactive):
     """
     PaneBase is the abstract baseclass for all atomic displayable units
@@ -71,10 +88,62 @@ class PaneBase(Reactive):
         """
         return None
 
+    @classmethod
+    def _type_key(cls, obj):
+        """
+        Returns a key used to cache the Pane type resolved for the
+        object. For most objects the type is sufficient, for strings,
+        dicts, lists and matplotlib figures the key also captures the
+        parts of the value inspected by the applies methods. Returns
+        None if the object should not be cached, e.g. for methods
+        whose owner determines the Pane type and objects which may be
+        yt plots, which are identified by their repr.
+        """
+        otype = type(obj)
+        if inspect.ismethod(obj):
+            return None
+        elif hasattr(obj, 'plots') and hasattr(obj, '_repr_html_'):
+            return None
+        elif 'matplotlib' in sys.modules:
+            from matplotlib.figure import Figure
+            if isinstance(obj, Figure):
+                return (otype, obj.canvas is None)
+        if isinstance(obj, basestring):
+            tail = obj[-4:]
+            ext = tail[tail.rfind('.')+1:] if '.' in tail else None
+            is_url = obj.startswith('http://') or obj.startswith('https://')
+            is_file = bool(ext) and not is_url and os.path.isfile(obj)
+            return (otype, ext, is_url, is_file, obj.lstrip().startswith('<svg'))
+        elif isinstance(obj, dict):
+            schema = obj.get('$schema')
+            if schema is not None and not isinstance(schema, basestring):
+                return None
+            return (otype, schema, isinstance(obj.get('data'), list))
+        elif isinstance(obj, list):
+            types = frozenset(type(o) for o in obj)
+            if any(issubclass(t, (basestring, dict, list)) for t in types):
+                return None
+            return (otype, types)
+        return otype
+
     @classmethod
     def get_pane_type(cls, obj):
         if isinstance(obj, Viewable):
             return type(obj)
+        try:
+            key = cls._type_key(obj)
+            pane_type = _pane_type_cache.get(key)
+        except TypeError:
+            key, pane_type = None, None
+        if pane_type is not None:
+            return pane_type
+        pane_type = cls._resolve_pane_type(obj)
+        if key is not None:
+            _pane_type_cache[key] = pane_type
+        return pane_type
+
+    @classmethod
+    def _resolve_pane_type(cls, obj):
         descendents = []
         for p in param.concrete_descendents(PaneBase).values():
             precedence = p.applies(obj) if p.precedence is None else p.precedence
@@ -144,12 +213,13 @@ class PaneBase(Reactive):
 
             if comm:
                 update_models()
-                push(doc, comm)
+                self._push(doc, comm)
             else:
                 doc.add_next_tick_callback(update_models)
 
         ref = model.ref['id']
-        self._callbacks[ref].append(self.param.watch(update_pane, 'object'))
+        watcher = self.param.watch(self._holdable(update_pane), 'object')
+        self._callbacks[ref].append(watcher)
 
 
 class Bokeh(PaneBase):
@@ -8,8 +8,10 @@ import os
 import json
 import types
 import inspect
+import weakref
 import itertools
 from collections import OrderedDict, namedtuple
+from functools import partial
 
 import param
 from param.parameterized import classlist
@@ -17,8 +19,8 @@ from param.parameterized import classlist
 from .pane import Pane, PaneBase
 from .layout import WidgetBox, Row, Layout, Tabs
 from .util import (
-    default_label_formatter, is_parameterized, get_method_owner,
-    full_groupby, push
+    LRUCache, LatestCall, default_label_formatter, is_parameterized, get_method_owner,
+    full_groupby, hashable
 )
 from .widgets import (
     LiteralInput, Select, Checkbox, FloatSlider, IntSlider, RangeSlider,
@@ -27,6 +29,35 @@ from .widgets import (
 )
 
 
+_missing = object()
+
+# Cache of display plans per Parameterized class keyed by Param options
+_plan_cache = weakref.WeakKeyDictionary()
+
+# Parameter metadata which determines the widget in a display plan
+_plan_metadata = ['constant', 'objects', 'bounds', 'softbounds', 'label']
+
+
+def _fingerprint(pobj):
+    """
+    Returns the plan metadata of a parameter, copying lists and dicts
+    so that in-place modifications are detected.
+    """
+    values = (getattr(pobj, m, None) for m in _plan_metadata)
+    return tuple(type(v)(v) if isinstance(v, (list, dict)) else v
+                 for v in values)
+
+
+def _fingerprint_matches(old, new):
+    """
+    Whether two metadata fingerprints are equal.
+    """
+    try:
+        return all(o is n or bool(o == n) for o, n in zip(old, new))
+    except Exception:
+        return False
+
+
 def ObjectSelector(pobj):
     """
     Determines param.ObjectSelector widget depending on whether all values
@@ -70,6 +101,15 @@ class Param(PaneBase):
     label_formatter = param.Callable(default=default_label_formatter, allow_None=True,
         doc="Callable used to format the parameter names into widget labels.")
 
+    lazy = param.Boolean(default=False, doc="""
+        Whether to group the parameters into collapsible sections by
+        precedence, constructing the widgets of a section only when
+        it is first expanded.""")
+
+    section_size = param.Integer(default=None, bounds=(1, None), doc="""
+        Maximum number of parameters in a lazy section, larger
+        precedence groups are split into multiple sections.""")
+
     parameters = param.List(default=None, doc="""
         If set this serves as a whitelist of parameters to display on the supplied
         Parameterized object.""")
@@ -116,8 +156,11 @@ class Param(PaneBase):
         super(Param, self).__init__(object, **params)
 
         # Construct widgets
+        self._plan = None
         self._widgets = self._get_widgets()
         widgets = [widget for widgets in self._widgets.values() for widget in widgets]
+        if self.lazy:
+            widgets += self._get_sections()
         self._widget_box = WidgetBox(*widgets, height=self.height,
                                      width=self.width, name=self.name)
 
@@ -141,8 +184,9 @@ class Param(PaneBase):
         if not (not self.toggleable_subobjects and not self.expand_by_default):
             self._link_subobjects()
 
-    def _link_subobjects(self):
-        for pname, widgets in self._widgets.items():
+    def _link_subobjects(self, items=None):
+        items = self._widgets.items() if items is None else items
+        for pname, widgets in items:
             if not any(is_parameterized(getattr(w, 'value', None)) or
                        any(is_parameterized(o) for o in getattr(w, 'options', []))
                        for w in widgets):
@@ -210,26 +254,28 @@ class Param(PaneBase):
                     return cls._mapping[t](pobj)
                 return cls._mapping[t]
 
-    def widget(self, p_name):
-        """Get widget for param_name"""
-        p_obj = self.object.params(p_name)
+    def _widget_plan(self, p_name, p_obj):
+        """
+        Returns the widget class, the keyword template and the
+        accepted keywords for a parameter from the display plan.
+        The entry is rebuilt if the parameter metadata changed.
+        """
+        plan = self._get_plan() if self._plan is None else self._plan
+        widgets = plan['widgets']
+        fingerprint = _fingerprint(p_obj)
+        entry = widgets.get(p_name)
+        if (entry is not None and entry[0] is p_obj and
+            _fingerprint_matches(entry[1], fingerprint)):
+            return entry[2:]
 
         widget_class = self.widget_type(p_obj)
-        value = getattr(self.object, p_name)
-
-        kw = dict(value=value, disabled=p_obj.constant)
+        kw = dict(disabled=p_obj.constant)
 
         if self.label_formatter is not None:
             kw['name'] = self.label_formatter(p_name)
         else:
             kw['name'] = p_name
 
-        if hasattr(p_obj, 'get_range'):
-            options = p_obj.get_range()
-            if not options and value is not None:
-                options = [value]
-            kw['options'] = options
-
         if hasattr(p_obj, 'get_soft_bounds'):
             bounds = p_obj.get_soft_bounds()
             if bounds[0] is not None:
@@ -239,7 +285,27 @@ class Param(PaneBase):
             if ('start' not in kw or 'end' not in kw) and not issubclass(widget_class, LiteralInput):
                 widget_class = LiteralInput
 
-        kwargs = {k: v for k, v in kw.items() if k in widget_class.params()}
+        accepted = set(widget_class.params())
+        kw = {k: v for k, v in kw.items() if k in accepted}
+        widgets[p_name] = (p_obj, fingerprint, widget_class, kw, accepted)
+        return widget_class, kw, accepted
+
+    def widget(self, p_name):
+        """Get widget for param_name"""
+        p_obj = self.object.params(p_name)
+
+        widget_class, template, accepted = self._widget_plan(p_name, p_obj)
+        value = getattr(self.object, p_name)
+
+        kw = dict(template, value=value)
+
+        if hasattr(p_obj, 'get_range'):
+            options = p_obj.get_range()
+            if not options and value is not None:
+                options = [value]
+            kw['options'] = options
+
+        kwargs = {k: v for k, v in kw.items() if k in accepted}
         widget = widget_class(**kwargs)
         watchers = self._callbacks['instance']
         if isinstance(p_obj, param.Action):
@@ -294,17 +360,49 @@ class Param(PaneBase):
         self._layout._cleanup(model, final)
         super(Param, self)._cleanup(model, final)
 
-    def _get_widgets(self):
-        """Return name,widget boxes for all parameters (i.e., a property sheet)"""
-        params = [(p, pobj) for p, pobj in self.object.params().items()
-                  if p in self.parameters or p == 'name']
+    def _get_plan(self):
+        """
+        Returns the display plan for the Parameterized object, holding
+        the parameters grouped by precedence and the widget type and
+        keyword template for each parameter. Plans are cached per
+        Parameterized class and each entry stores a fingerprint of the
+        parameter metadata it was built from, so entries are rebuilt
+        when the metadata changes.
+        """
+        cls = self.object if isinstance(self.object, type) else type(self.object)
+        plans = _plan_cache.setdefault(cls, {})
+        key = (tuple(self.parameters), self.display_threshold,
+               self.default_precedence, self.label_formatter)
+        params = {p: pobj for p, pobj in self.object.params().items()
+                  if p in self.parameters or p == 'name'}
+        precedence = {p: pobj.precedence for p, pobj in params.items()}
+        plan = plans.get(key)
+        if plan is None or any(plan['params'].get(p) is not pobj
+                               for p, pobj in params.items()):
+            plan = {'params': params, 'widgets': {}}
+            # Instance specific parameters cannot be shared
+            if all(cls.param.params(p) is pobj for p, pobj in params.items()):
+                plans[key] = plan
+        if plan.get('precedence') != precedence:
+            plan['precedence'] = precedence
+            plan['groups'] = self._get_groups(params)
+        self._plan = plan
+        return plan
+
+    def _get_groups(self, params):
+        """Return the parameters to display grouped by precedence"""
+        params = list(params.items())
         key_fn = lambda x: x[1].precedence if x[1].precedence is not None else self.default_precedence
         sorted_precedence = sorted(params, key=key_fn)
         filtered = [(k,p) for (k,p) in sorted_precedence
                     if ((p.precedence is None) or (p.precedence >= self.display_threshold))]
         groups = itertools.groupby(filtered, key=key_fn)
         sorted_groups = [sorted(grp) for (k,grp) in groups]
-        ordered_params = [el[0] for group in sorted_groups for el in group]
+        return [[el[0] for el in group] for group in sorted_groups]
+
+    def _get_widgets(self):
+        """Return name,widget boxes for all parameters (i.e., a property sheet)"""
+        ordered_params = [p for group in self._get_plan()['groups'] for p in group]
 
         # Format name specially
         ordered_params.pop(ordered_params.index('name'))
@@ -312,9 +410,45 @@ class Param(PaneBase):
             widgets = []
         else:
             widgets = [('name', [StaticText(value='<b>{0}</b>'.format(self.object.name))])]
-        widgets += [(pname, self.widget(pname)) for pname in ordered_params]
+        if not self.lazy:
+            widgets += [(pname, self.widget(pname)) for pname in ordered_params]
         return OrderedDict(widgets)
 
+    def _get_sections(self):
+        """Return toggles which expand lazily constructed sections"""
+        sections = []
+        for group in self._get_plan()['groups']:
+            group = [p for p in group if p != 'name']
+            if not group:
+                continue
+            size = self.section_size or len(group)
+            for i in range(0, len(group), size):
+                pnames = group[i:i+size]
+                labels = [self.label_formatter(p) if self.label_formatter else p
+                          for p in (pnames[0], pnames[-1])]
+                label = labels[0] if len(pnames) == 1 else ' ... '.join(labels)
+                toggle = Toggle(name=label)
+                watcher = toggle.param.watch(partial(self._toggle_section, pnames), 'active')
+                self._callbacks['instance'].append(watcher)
+                sections.append(toggle)
+        return sections
+
+    def _toggle_section(self, pnames, event):
+        """Inserts or removes the widgets of a section, constructing them once"""
+        box = self._widget_box
+        if not event.new:
+            removed = [id(w) for p in pnames for w in self._widgets.get(p, [])]
+            box.objects = [o for o in box.objects if id(o) not in removed]
+            return
+        new = [(p, self.widget(p)) for p in pnames if p not in self._widgets]
+        self._widgets.update(new)
+        if new and (self.toggleable_subobjects or self.expand_by_default):
+            self._link_subobjects(new)
+        objects = list(box.objects)
+        index = objects.index(event.obj) + 1
+        objects[index:index] = [w for p in pnames for w in self._widgets[p]]
+        box.objects = objects
+
     def _get_model(self, doc, root=None, parent=None, comm=None):
         return self._layout._get_model(doc, root, parent, comm)
 
@@ -334,23 +468,74 @@ class ParamMethod(PaneBase):
     return any object which itself can be rendered as a Pane.
     """
 
+    debounce = param.Integer(default=None, bounds=(0, None), doc="""
+        Interval in milliseconds within which bursts of dependency
+        changes are collapsed into a single evaluation of the method.
+        By default the method is evaluated on every change.""")
+
+    cache_size = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of method outputs to memoize, keyed by the current
+        values of the method's dependencies. Disabled if zero.""")
+
+    executor = param.Parameter(default=None, doc="""
+        An optional executor, e.g. a concurrent.futures.ThreadPoolExecutor,
+        used to evaluate the method off the event loop. While the
+        method is running the previous output remains visible with
+        the loading_class CSS class applied, only the output of the
+        latest call is rendered.""")
+
+    # CSS class applied to the output while it is being recomputed
+    loading_class = 'pn-loading'
+
     def __init__(self, object, **params):
         self._kwargs =  {p: params.pop(p) for p in list(params)
                          if p not in self.params()}
         super(ParamMethod, self).__init__(object, **params)
-        self._pane = Pane(self.object(), name=self.name,
+        self._cache = LRUCache(self.cache_size) if self.cache_size else None
+        self._pane = Pane(self._evaluate(), name=self.name,
                           **dict(_temporary=True, **self._kwargs))
 
     @classmethod
     def applies(cls, obj):
         return inspect.ismethod(obj) and isinstance(get_method_owner(obj), param.Parameterized)
 
+    def _cache_key(self):
+        parameterized = get_method_owner(self.object)
+        deps = parameterized.param.params_depended_on(self.object.__name__)
+        key = []
+        for dep in deps:
+            if dep.what != 'value':
+                continue
+            pobj = dep.cls if dep.inst is None else dep.inst
+            key.append((id(pobj), dep.name, hashable(getattr(pobj, dep.name))))
+        key = tuple(key)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _evaluate(self):
+        """
+        Evaluates the method, looking up the output in the cache if
+        caching is enabled.
+        """
+        key = None if self._cache is None else self._cache_key()
+        if key is None:
+            return self.object()
+        new_object = self._cache.get(key, _missing)
+        if new_object is _missing:
+            new_object = self.object()
+            self._cache[key] = new_object
+        return new_object
+
     def _get_model(self, doc, root=None, parent=None, comm=None):
         parameterized = get_method_owner(self.object)
         params = parameterized.param.params_depended_on(self.object.__name__)
         model = self._pane._get_model(doc, root, parent, comm)
         history = [model]
         deps = params
+        scheduled = []
 
         def update_pane(*events):
             old_model = history[0]
@@ -380,8 +565,62 @@ class ParamMethod(PaneBase):
                     for p in params:
                         deps.append(p)
 
+            if self.debounce is None:
+                evaluate()
+            elif not scheduled:
+                # Collapse further changes within the interval
+                scheduled.append(True)
+                if comm:
+                    from tornado.ioloop import IOLoop
+                    IOLoop.current().call_later(self.debounce/1000., flush)
+                else:
+                    doc.add_timeout_callback(flush, self.debounce)
+        update_pane = self._holdable(update_pane)
+
+        def flush():
+            del scheduled[:]
+            if history[0].ref['id'] in self._callbacks:
+                evaluate()
+
+        if self.executor is None:
+            def evaluate():
+                render(self._evaluate())
+        else:
+            if comm:
+                from tornado.ioloop import IOLoop
+                schedule = IOLoop.current().add_callback
+            else:
+                schedule = doc.add_next_tick_callback
+            requested = [None]
+            def resolve(new_object):
+                if requested[0] is not None:
+                    self._cache[requested[0]] = new_object
+                loading_model = history[0]
+                try:
+                    render(new_object)
+                finally:
+                    self._set_loading(loading_model, False, doc, comm)
+            def error(e):
+                self._set_loading(history[0], False, doc, comm)
+                self.param.warning('Evaluating %s raised %s: %s' %
+                                   (self.object.__name__, type(e).__name__, e))
+            call = LatestCall(self.executor, resolve, schedule, error)
+            def evaluate():
+                key = None if self._cache is None else self._cache_key()
+                cached = _missing if key is None else self._cache.get(key, _missing)
+                if cached is not _missing:
+                    requested[0] = None
+                    call.set_result(cached)
+                else:
+                    requested[0] = key
+                    self._set_loading(history[0], True, doc, comm)
+                    call(self.object)
+
+        def render(new_object):
+            old_model = history[0]
+            old_ref = old_model.ref['id']
+
             # Try updating existing pane
-            new_object = self.object()
             pane_type = self.get_pane_type(new_object)
             if type(self._pane) is pane_type:
                 index = parent.children.index(old_model)
@@ -425,7 +664,7 @@ class ParamMethod(PaneBase):
 
             if comm:
                 update_models()
-                push(doc, comm)
+                self._push(doc, comm)
             else:
                 doc.add_next_tick_callback(update_models)
 
@@ -439,6 +678,12 @@ class ParamMethod(PaneBase):
 
         return model
 
+    def _set_loading(self, model, loading, doc, comm=None):
+        css_classes = [c for c in model.css_classes if c != self.loading_class]
+        if loading:
+            css_classes.append(self.loading_class)
+        self._update_models(doc, [(model, {'css_classes': css_classes})], comm)
+
     def _cleanup(self, model=None, final=False):
         self._pane._cleanup(model, final)
         super(ParamMethod, self)._cleanup(model, final)
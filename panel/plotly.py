@@ -5,6 +5,7 @@ import os
 import param
 import numpy as np
 from bokeh.core.properties import Dict, String, List, Any, Instance
+from bokeh.core.property.validation import validate
 from bokeh.models import LayoutDOM, ColumnDataSource
 
 from .pane import PaneBase
@@ -18,14 +19,17 @@ class PlotlyPlot(LayoutDOM):
 
     __implementation__ = os.path.join(os.path.dirname(__file__), 'models', 'plotly.ts')
 
-    data = Dict(String, Any)
+    data = List(Any)
+
+    layout = Dict(String, Any)
 
     data_sources = List(Instance(ColumnDataSource))
 
 
 class Plotly(PaneBase):
     """
-    Plotly panes allow rendering plotly Figures and traces.
+    Plotly panes allow rendering plotly Figures and traces, either as
+    plotly objects or as the equivalent dict and list specs.
 
     For efficiency any array objects found inside a Figure are added
     to a ColumnDataSource which allows using binary transport to sync
@@ -39,57 +43,202 @@ class Plotly(PaneBase):
     precedence = 0.8
     
     def __init__(self, object, layout=None, **params):
-        super(Plotly, self).__init__(self._to_figure(object, layout),
-                                     layout=layout, **params)
+        super(Plotly, self).__init__(object, layout=layout, **params)
+        self._layout_cache = None
 
     @classmethod
     def applies(cls, obj):
-        return ((isinstance(obj, list) and all(cls.applies(o) for o in obj)) or
-                hasattr(obj, 'to_plotly_json'))
+        if isinstance(obj, list):
+            return all(cls.applies(o) or (isinstance(o, dict) and 'type' in o)
+                       for o in obj)
+        elif isinstance(obj, dict):
+            return '$schema' not in obj and isinstance(obj.get('data'), list)
+        return hasattr(obj, 'to_plotly_json')
+
+    @classmethod
+    def _copy_spec(cls, obj):
+        """
+        Copies the dicts, lists and arrays in a plotly spec, so the
+        data sources own their arrays and may patch them in place.
+        """
+        if isinstance(obj, dict):
+            return {k: cls._copy_spec(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [cls._copy_spec(v) for v in obj]
+        elif isinstance(obj, np.ndarray):
+            return obj.copy()
+        return obj
 
-    def _to_figure(self, obj, layout={}):
-        import plotly.graph_objs as go
-        if isinstance(obj, go.Figure):
-            fig = obj
+    @classmethod
+    def _trace_json(cls, trace):
+        if isinstance(trace, dict):
+            return cls._copy_spec(trace)
+        # Trace objects have already been validated
+        return trace.to_plotly_json()
+
+    def _get_layout(self):
+        """
+        Returns the validated JSON for the layout parameter, which is
+        cached until a new layout is supplied.
+        """
+        if self._layout_cache is None or self._layout_cache[0] is not self.layout:
+            import plotly.graph_objs as go
+            json = go.Layout(self.layout or {}).to_plotly_json()
+            self._layout_cache = (self.layout, json)
+        return self._layout_cache[1]
+
+    def _get_json(self):
+        """
+        Returns the plotly JSON for the object. Raw dict and list specs
+        and already validated Figures and traces are converted without
+        constructing and validating a new plotly Figure.
+        """
+        obj = self.object
+        if isinstance(obj, dict):
+            data = [self._copy_spec(trace) for trace in obj['data']]
+            layout = (self._copy_spec(obj['layout']) if 'layout' in obj
+                      else self._get_layout())
+        elif hasattr(obj, 'data') and hasattr(obj, 'layout'):
+            # Figures have already been validated
+            return obj.to_plotly_json()
         else:
-            data = obj if isinstance(obj, list) else [obj]
-            fig = go.Figure(data=data, layout=layout)
-        return fig
+            traces = obj if isinstance(obj, list) else [obj]
+            data = [self._trace_json(trace) for trace in traces]
+            layout = self._get_layout()
+        return {'data': data, 'layout': layout}
+
+    @classmethod
+    def _get_sources(cls, json):
+        """
+        Pops all numpy arrays out of the traces in the plotly json and
+        returns a dictionary of data for each trace. Nested arrays are
+        keyed by their dotted path, e.g. 'marker.color'.
+        """
+        datas = []
+        for trace in json['data']:
+            data = {}
+            cls._extract_arrays(trace, data)
+            datas.append(data)
+        return datas
+
+    @classmethod
+    def _extract_arrays(cls, obj, data, path=None):
+        """
+        Recursively moves numpy arrays in the supplied dict or list
+        into the data dictionary. Arrays are removed from dicts and
+        replaced with None in lists so they can be reinserted by path.
+        """
+        items = list(obj.items() if isinstance(obj, dict) else enumerate(obj))
+        for key, value in items:
+            key_path = str(key) if path is None else '%s.%s' % (path, key)
+            if isinstance(value, np.ndarray):
+                data[key_path] = value
+                if isinstance(obj, dict):
+                    del obj[key]
+                else:
+                    obj[key] = None
+            elif isinstance(value, (dict, list)):
+                cls._extract_arrays(value, data, key_path)
+
+    @staticmethod
+    def _update_data_source(cds, data):
+        """
+        Updates the ColumnDataSource with the new data, sending only
+        the values which were appended (via stream) or changed (via
+        patch) when all columns are one-dimensional arrays of matching
+        type and length. Falls back to replacing the data otherwise.
+        """
+        old = cds.data
+        if not data or set(old) != set(data):
+            cds.data = data
+            return
+
+        patches, streams, lengths = {}, {}, set()
+        for key, new in data.items():
+            prev = old[key]
+            if (not isinstance(prev, np.ndarray) or prev.ndim != 1 or
+                new.ndim != 1 or prev.dtype != new.dtype or
+                len(new) < len(prev)):
+                cds.data = data
+                return
+            n = len(prev)
+            changed = prev != new[:n]
+            if new.dtype.kind in 'fc':
+                changed &= ~(np.isnan(prev) & np.isnan(new[:n]))
+            changed = np.flatnonzero(changed)
+            if len(changed):
+                start, end = changed[0], changed[-1]+1
+                if (end-start) > n/2.:
+                    cds.data = data
+                    return
+                patches[key] = [(slice(start, end), new[start:end])]
+            if len(new) > n:
+                streams[key] = new[n:]
+            lengths.add((n, len(new)))
+
+        if len(lengths) != 1 or (streams and len(streams) != len(data)):
+            cds.data = data
+            return
+        if patches:
+            # Patches are applied in place to the arrays, which are
+            # copies made when the plotly JSON was generated
+            cds.patch(patches)
+        if streams:
+            cds.stream(streams)
 
     def _get_model(self, doc, root, parent=None, comm=None):
         """
         Should return the bokeh model to be rendered.
         """
-        fig = self._to_figure(self.object, self.layout)
-        json = fig.to_plotly_json()
-        traces = json['data']
-        sources = []
-        for trace in traces:
-            data = {}
-            for key, value in list(trace.items()):
-                if isinstance(value, np.ndarray):
-                    data[key] = trace.pop(key)
-            sources.append(ColumnDataSource(data))
-        model = PlotlyPlot(data=json, data_sources=sources)
+        json = self._get_json()
+        # The extracted data is known to be valid, so skip the costly
+        # elementwise validation of the ColumnDataSource columns
+        with validate(False):
+            sources = [ColumnDataSource(data) for data in self._get_sources(json)]
+        model = PlotlyPlot(data=json['data'], layout=json['layout'],
+                           data_sources=sources)
         self._link_object(model, doc, root, parent, comm)
+        self._link_layout(model, doc, comm)
         return model
 
+    def _link_layout(self, model, doc, comm=None):
+        """
+        Links the layout parameter to the rendered model, updating only
+        the layout (and none of the trace data) when it changes.
+        """
+        def update_layout(change):
+            obj = self.object
+            if (isinstance(obj, dict) and 'layout' in obj) or hasattr(obj, 'layout'):
+                # The layout parameter is ignored if the object has a layout
+                return
+            def update_models():
+                model.layout = self._get_layout()
+            if comm:
+                update_models()
+                self._push(doc, comm)
+            else:
+                doc.add_next_tick_callback(update_models)
+
+        watcher = self.param.watch(self._holdable(update_layout), 'layout')
+        self._callbacks[model.ref['id']].append(watcher)
+
     def _update(self, model):
-        fig = self._to_figure(self.object, self.layout)
-        json = fig.to_plotly_json()
-        traces = json['data']
+        json = self._get_json()
+        # Plotly assigns random uids to new traces, which would force
+        # plotly.js to recreate each trace, so reuse the previous uid
+        # when a trace of the same type replaces another
+        for old, new in zip(model.data, json['data']):
+            if 'uid' in old and old.get('type') == new.get('type'):
+                new['uid'] = old['uid']
         new_sources = []
-        for i, trace in enumerate(traces):
-            if i < len(model.data_sources):
-                cds = model.data_sources[i]
-            else:
-                cds = ColumnDataSource()
-                new_sources.append(cds)
-            data = {}
-            for key, value in list(trace.items()):
-                if isinstance(value, np.ndarray):
-                    data[key] = trace.pop(key)
-            cds.data = data
-        model.data = json
+        with validate(False):
+            for i, data in enumerate(self._get_sources(json)):
+                if i < len(model.data_sources):
+                    self._update_data_source(model.data_sources[i], data)
+                else:
+                    new_sources.append(ColumnDataSource(data))
+        # Trace and layout properties are only sent if they changed
+        model.data = json['data']
+        model.layout = json['layout']
         if new_sources:
             model.data_sources += new_sources
@@ -3,13 +3,13 @@ from __future__ import absolute_import
 from collections import OrderedDict
 import pytest
 
-from bokeh.models import (Row as BkRow, Column as BkColumn, GlyphRenderer,
-                          Circle, Line)
+from bokeh.models import (Row as BkRow, Column as BkColumn, Div as BkDiv,
+                          GlyphRenderer, Circle, Line)
 from bokeh.plotting import Figure
 
 from panel.holoviews import HoloViews
 from panel.layout import Column, Row
-from panel.pane import Pane, PaneBase
+from panel.pane import Bokeh, Pane, PaneBase, Str
 from panel.widgets import FloatSlider, DiscreteSlider, Select
 
 try:
@@ -20,6 +20,7 @@ hv_available = pytest.mark.skipif(hv is None, reason="requires holoviews")
 
 from .test_layout import get_div
 from .test_panes import mpl_available
+from .test_util import run_callbacks
 
 
 @hv_available
@@ -88,6 +89,43 @@ def test_holoviews_pane_bokeh_renderer(document, comm):
     assert pane._callbacks == {}
 
 
+@pytest.mark.usefixtures("hv_bokeh")
+@hv_available
+def test_holoviews_pane_cache_plot(document, comm):
+    from panel.holoviews import _plot_cache
+    curve = hv.Curve([1, 2, 3])
+    pane = HoloViews(curve, cache_plot=True)
+
+    row1 = pane._get_root(document, comm=comm)
+    row2 = pane._get_root(document, comm=comm)
+    model1, model2 = row1.children[0], row2.children[0]
+    assert isinstance(model2, Figure)
+    assert model1.ref['id'] != model2.ref['id']
+    assert model1.select_one({'type': GlyphRenderer}).ref['id'] != \
+        model2.select_one({'type': GlyphRenderer}).ref['id']
+    assert len(pane._plots) == 1
+    assert _plot_cache.get(pane._plot_key(comm))
+
+    pane._cleanup(model2)
+    assert len(pane._plots) == 1
+
+
+@hv_available
+def test_holoviews_pane_cache_plot_key_options_and_params(document, comm):
+    overlay = hv.Curve([1, 2, 3]) * hv.Curve([3, 2, 1])
+    pane = HoloViews(overlay, cache_plot=True)
+    key = pane._plot_key(comm)
+
+    # Options applied to a nested object
+    overlay.get(0).opts(plot=dict(width=200), clone=False)
+    options_key = pane._plot_key(comm)
+    assert options_key != key
+
+    # Parameters of the pane
+    pane.show_widgets = False
+    assert pane._plot_key(comm) not in (key, options_key)
+
+
 @hv_available
 def test_holoviews_widgets_from_dynamicmap(document, comm):
     range_dim = hv.Dimension('A', range=(0, 10.))
@@ -183,6 +221,116 @@ def test_holoviews_with_widgets_not_shown(document, comm):
     assert hv_pane.widget_box.objects[1].name == 'B'
 
     
+@pytest.mark.usefixtures("hv_mpl")
+@mpl_available
+@hv_available
+def test_holoviews_frame_cache(document, comm):
+    hmap = hv.HoloMap({i: hv.Curve([i]) for i in range(3)}, kdims=['X'])
+
+    hv_pane = HoloViews(hmap, cache_size=5)
+    layout = hv_pane._get_root(document, comm)
+    plot = hv_pane._plots[layout.children[0].ref['id']]
+    keys = []
+    update = plot.update
+    plot.update = lambda key: keys.append(key) or update(key)
+
+    widget = hv_pane.widget_box.objects[0]
+    div = get_div(layout.children[0].children[0])
+    text = div.text
+    widget.value = 1
+    assert div.text != text
+    widget.value = 0
+    widget.value = 1
+    assert keys == [(1,), (0,)]
+    assert hv_pane._frames[1].stats['hits'] == 1
+
+
+def test_holoviews_neighbor_keys():
+    widgets = [DiscreteSlider(options=[0, 1, 2], value=1),
+               Select(options=['A', 'B', 'C'], value='B')]
+
+    neighbors = HoloViews._neighbor_keys(widgets, (1, 'B'), 1)
+    assert neighbors == [(2, 'B'), (0, 'B'), (1, 'C'), (1, 'A')]
+
+
+class MockRenderer(object):
+
+    backend = 'matplotlib'
+
+
+class MockPlot(object):
+    """
+    Stands in for a HoloViews plot, rendering each frame using the
+    supplied function.
+    """
+
+    renderer = MockRenderer()
+
+    def __init__(self, render):
+        self.render = render
+        self.state = render((0,))
+        self.keys = []
+
+    def update(self, key):
+        self.keys.append(key)
+        self.state = self.render(key)
+
+
+@pytest.fixture
+def mock_hv_pane(monkeypatch):
+    """
+    Allows constructing a HoloViews pane without a HoloViews object.
+    """
+    monkeypatch.setattr(HoloViews, 'applies', classmethod(lambda cls, obj: True))
+    return lambda **params: HoloViews(None, **params)
+
+
+def test_holoviews_frame_cache_prefetch_mock_plot(document, mock_hv_pane):
+    plot = MockPlot(lambda key: str(key[0]))
+    pane = Str(plot.state)
+    div = pane._get_model(document)
+    widget = DiscreteSlider(options=[0, 1, 2, 3], value=0)
+    hv_pane = mock_hv_pane(cache_size=5, prefetch=1)
+    hv_pane._link_widgets([widget], pane, div, BkRow(), plot, document, None)
+
+    widget.value = 2
+    run_callbacks(document, once=True)
+    assert plot.keys == [(2,), (3,)]
+    assert div.text == '<pre>2</pre>'
+
+    # Each callback prefetches a single frame without touching the pane
+    run_callbacks(document, once=True)
+    assert plot.keys == [(2,), (3,), (1,)]
+    assert div.text == '<pre>2</pre>'
+    assert pane.object == '0'
+    run_callbacks(document, once=True)
+    assert document.session_callbacks == []
+
+    # Cached neighbors are skipped
+    widget.value = 1
+    run_callbacks(document)
+    assert plot.keys[3:] == [(0,)]
+    assert div.text == '<pre>1</pre>'
+    assert hv_pane._frames[1].stats['hits'] == 1
+
+
+def test_holoviews_frame_cache_non_div_pane(document, comm, mock_hv_pane):
+    plot = MockPlot(lambda key: BkDiv(text=str(key[0])))
+    pane = Bokeh(plot.state)
+    row = BkRow()
+    model = pane._get_model(document, row, row, comm)
+    row.children = [model]
+    widget = DiscreteSlider(options=[0, 1, 2], value=0)
+    hv_pane = mock_hv_pane(cache_size=5)
+    hv_pane._link_widgets([widget], pane, model, row, plot, document, comm)
+
+    widget.value = 1
+    assert hv_pane._frames is None
+    assert plot.keys == [(1,)]
+    assert pane.object is plot.state
+    assert get_div(row.children[0]).text == '1'
+
+
 @hv_available
 def test_holoviews_widgets_from_holomap():
     hmap = hv.HoloMap({(i, chr(65+i)): hv.Curve([i]) for i in range(3)}, kdims=['X', 'Y'])
@@ -254,6 +402,26 @@ def test_holoviews_link_across_panes(document, comm):
     range_tool.x_range = p2.x_range
 
 
+@pytest.mark.usefixtures("hv_bokeh")
+@hv_available
+def test_holoviews_plot_index(document, comm):
+    from panel.holoviews import _plot_index, _lookup, is_bokeh_element_plot
+
+    c1 = hv.Curve([1, 2])
+    c2 = hv.Curve([2, 3])
+    pane = HoloViews(hv.Layout([c1, c2]))
+    pane._get_root(document, comm=comm)
+    root_plot, = pane._plots.values()
+    plots = [(plot, root_plot) for plot in
+             root_plot.traverse(lambda x: x, [is_bokeh_element_plot])]
+
+    index = _plot_index(plots)
+
+    assert [p.hmap.last for p, _ in _lookup(index, c1)] == [c1]
+    assert [p.hmap.last for p, _ in _lookup(index, c2)] == [c2]
+    assert _lookup(index, hv.Curve([])) == []
+
+
 @hv_available
 def test_holoviews_link_within_pane(document, comm):
     from bokeh.models.tools import RangeTool
@@ -1,3 +1,5 @@
+import pytest
+
 from bokeh.models import (Div as BkDiv, Column as BkColumn,
                           WidgetBox as BkWidgetBox, Paragraph as BkParagraph)
 
@@ -5,6 +7,7 @@ from panel.interact import interact, interact_manual
 from panel import widgets
 
 from .test_layout import get_div
+from .test_util import ManualExecutor, run_callbacks
 
 
 def test_boolean_interact():
@@ -198,3 +201,167 @@ def test_interact_replaces_model(document, comm):
     interactive._cleanup(column)
     assert interactive._callbacks == {}
     assert pane._callbacks == {}
+
+
+def test_interact_cache(document, comm):
+    calls = []
+    def test(a):
+        calls.append(a)
+        return a
+
+    interactive = interact.options(cache_size=5)(test, a=(0, 10))
+    widget = interactive._widgets['a']
+
+    column = interactive._get_model(document, comm=comm)
+    div = get_div(column.children[1])
+    assert div.text == '<pre>5</pre>'
+
+    widget.value = 3
+    widget.value = 5
+    assert div.text == '<pre>5</pre>'
+    assert calls == [5, 3]
+    assert interactive.cache.stats['hits'] == 1
+
+    # Cache is shared with other instances wrapping the same function
+    other = interact.options(cache_size=5)(test, a=(0, 10))
+    assert other.cache is interactive.cache
+    assert calls == [5, 3]
+
+
+def test_interact_cache_skips_models_and_panes(document, comm):
+    calls = []
+    def test(a):
+        calls.append(a)
+        return BkDiv(text=str(a))
+
+    interactive = interact.options(cache_size=5)(test, a=(0, 10))
+    widget = interactive._widgets['a']
+    interactive._get_model(document, comm=comm)
+
+    widget.value = 3
+    widget.value = 5
+    assert calls == [5, 3, 5]
+    assert len(interactive.cache) == 0
+
+
+def test_interact_hold_coalesces_updates(document, comm):
+    calls = []
+    def test(a, b):
+        calls.append((a, b))
+        return a + b
+
+    interactive = interact(test, a=(0, 10), b=(0, 10))
+    column = interactive._get_model(document, comm=comm)
+    div = get_div(column.children[1])
+
+    with interactive.hold():
+        interactive._widgets['a'].value = 1
+        interactive._widgets['b'].value = 2
+    assert calls == [(5, 5), (1, 2)]
+    assert div.text == '<pre>3</pre>'
+
+
+def test_interact_server_coalesces_updates(document):
+    calls = []
+    def test(a, b):
+        calls.append((a, b))
+        return a + b
+
+    interactive = interact(test, a=(0, 10), b=(0, 10))
+    interactive._get_model(document)
+
+    interactive._widgets['a'].value = 1
+    n_callbacks = len(document.session_callbacks)
+    interactive._widgets['b'].value = 2
+    assert len(document.session_callbacks) == n_callbacks
+    assert calls == [(5, 5)]
+    for cb in list(document.session_callbacks):
+        cb.callback()
+    assert calls == [(5, 5), (1, 2)]
+
+
+def test_interact_executor(document):
+    def test(a):
+        if a == 0:
+            raise ValueError('Failed')
+        return a
+
+    executor = ManualExecutor()
+    interactive = interact.options(executor=executor)(test, a=(0, 10))
+    column = interactive._get_model(document)
+    div = get_div(column.children[1])
+    assert div.text == '<pre>5</pre>'
+
+    # Result is rendered once the executor completes the call
+    interactive._widgets['a'].value = 3
+    run_callbacks(document)
+    assert len(executor.submitted) == 1
+    assert div.text == '<pre>5</pre>'
+    executor.run()
+    run_callbacks(document)
+    assert div.text == '<pre>3</pre>'
+
+    # Errors are reported and the previous output is retained
+    interactive._widgets['a'].value = 0
+    run_callbacks(document)
+    executor.run()
+    run_callbacks(document)
+    assert div.text == '<pre>3</pre>'
+
+    # Subsequent calls still update the output
+    interactive._widgets['a'].value = 7
+    run_callbacks(document)
+    executor.run()
+    run_callbacks(document)
+    assert div.text == '<pre>7</pre>'
+
+
+def test_interact_embed():
+    calls = []
+    def test(a, b, c):
+        calls.append((a, b, c))
+        return '%s %s' % (a, b) if c else 'off'
+
+    interactive = interact(test, a=widgets.DiscreteSlider(options=list(range(10))),
+                           b=['x', 'y'], c=True)
+    model = interactive.embed(max_states=20)
+
+    assert len(calls) == 21
+    slider = model.children[0].children[1]
+    callback = slider.js_property_callbacks['change:value'][0]
+    # Subsampled states with the 'off' output only embedded once
+    assert len(callback.args['states']) == 11
+    assert callback.args['target'] is model
+    assert model.children[1] in callback.args['states']
+    assert interactive._callbacks == {}
+    assert not any(m._callbacks for m in model.references())
+
+
+def test_interact_embed_deduplicates_fresh_outputs():
+    def test(a, b):
+        return BkDiv(text='on' if b else 'off')
+
+    interactive = interact(test, a=['x', 'y', 'z'], b=True)
+    model = interactive.embed()
+
+    slider = model.children[0].children[0]
+    callback = slider.js_property_callbacks['change:value'][0]
+    assert len(callback.args['states']) == 2
+
+
+def test_interact_embed_non_discrete_widget():
+    def test(a):
+        return a
+
+    interactive = interact(test, a='text')
+    with pytest.raises(ValueError):
+        interactive.embed()
+
+
+def test_interact_embed_max_bytes():
+    def test(a):
+        return a
+
+    interactive = interact(test, a=['A', 'B'])
+    with pytest.raises(ValueError):
+        interactive.embed(max_bytes=10)
@@ -5,8 +5,9 @@ import pytest
 from bokeh.models import (Div, Row as BkRow, Tabs as BkTabs,
                           Column as BkColumn, Panel as BkPanel,
                           WidgetBox as BkWidgetBox, Spacer as BkSpacer)
-from panel.layout import Column, Row, Tabs, Spacer
-from panel.pane import Bokeh, Pane
+from bokeh.server.callbacks import TimeoutCallback
+from panel.layout import Column, Row, Tabs, Spacer, VirtualColumn
+from panel.pane import Bokeh, HTML, Pane
 
 
 def get_div(box):
@@ -128,6 +129,161 @@ def test_layout_pop(panel, document, comm):
     assert p1._callbacks == {}
 
 
+@pytest.mark.parametrize('panel', [Column, Row])
+def test_layout_reuses_models(panel, document, comm):
+    div1 = Div()
+    div2 = Div()
+    layout = panel(div1, div2)
+    p1, p2 = layout.objects
+
+    model = layout._get_model(document, comm=comm)
+    c1, c2 = model.children[:2]
+
+    layout.objects = [p2, p1]
+    assert model.children == [c2, c1]
+    assert c1.ref['id'] in p1._callbacks
+    assert c2.ref['id'] in p2._callbacks
+
+
+@pytest.mark.parametrize('panel', [Column, Row])
+def test_layout_reuses_models_by_key(panel, document, comm):
+    div1 = Div()
+    div2 = Div()
+    p1 = Bokeh(div1, key='a')
+    layout = panel(p1, div2)
+
+    model = layout._get_model(document, comm=comm)
+    c1 = model.children[0]
+
+    layout.objects = [Bokeh(div1, key='a')]
+    assert layout.objects == [p1]
+    assert model.children == [c1]
+
+
+def test_layout_keyed_pane_with_new_params_not_reused(document, comm):
+    html = '<b>Text</b>'
+    p1 = HTML(html, key='a')
+    layout = Tabs(p1)
+
+    model = layout._get_model(document, comm=comm)
+    c1, = model.tabs
+
+    layout.objects = [HTML(html, key='a')]
+    assert layout.objects == [p1]
+    assert model.tabs == [c1]
+
+    p2 = HTML(html, key='a', width=300)
+    layout.objects = [p2]
+    assert layout.objects == [p2]
+    assert model.tabs[0] is not c1
+    assert model.tabs[0].child.width == 300
+
+    c2, = model.tabs
+    p3 = HTML(html, key='a', width=300, name='Title')
+    layout.objects = [p3]
+    assert layout.objects == [p3]
+    assert model.tabs[0] is not c2
+    assert model.tabs[0].title == 'Title'
+
+
+def test_layout_append_splices_children(document, comm):
+    div1 = Div()
+    div2 = Div()
+    layout = Row(div1, div2)
+    p1, p2 = layout.objects
+
+    model = layout._get_model(document, comm=comm)
+    c1, c2 = model.children
+
+    def get_objects(*args, **kwargs):
+        raise AssertionError('Layout should not reconcile all objects')
+    layout._get_objects = get_objects
+
+    div3 = Div()
+    layout.append(div3)
+    layout.insert(-1, Div())
+    layout.pop(p1)
+    assert model.children[0] is c2
+    assert get_div(model.children[-1]) is div3
+    assert len(model.children) == 3
+    assert p1._callbacks == {}
+
+
+def test_layout_hold(document, comm):
+    div1 = Div()
+    div2 = Div()
+    layout = Row(div1)
+
+    model = layout._get_model(document, comm=comm)
+    c1 = model.children[0]
+
+    with layout.hold():
+        layout.append(div2)
+        layout.insert(0, Div())
+        assert model.children == [c1]
+
+    assert len(model.children) == 3
+    assert model.children[1] is c1
+    assert get_div(model.children[2]) is div2
+
+
+def test_layout_hold_single_server_update(document):
+    layout = Row(Div())
+    model = layout._get_model(document)
+
+    with layout.hold():
+        for _ in range(5):
+            layout.append(Div())
+
+    assert len(document.session_callbacks) == 1
+    document.session_callbacks[0].callback()
+    assert len(model.children) == 6
+
+
+def test_virtual_column(document, comm):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, item_height=100, viewport_height=300, overscan=1)
+    panes = column.objects
+
+    model = column._get_model(document, comm=comm)
+    top, bottom = model.children[0], model.children[-1]
+    assert top.height == 0
+    assert bottom.height == 9500
+    assert get_divs(model.children[1:-1]) == divs[:5]
+    assert all(p._callbacks == {} for p in panes[5:])
+
+    column.scroll_top = 5000
+    top, bottom = model.children[0], model.children[-1]
+    assert top.height == 4900
+    assert bottom.height == 4500
+    assert get_divs(model.children[1:-1]) == divs[49:55]
+    assert all(p._callbacks == {} for p in panes[:5])
+
+    column._cleanup(model)
+    assert all(p._callbacks == {} for p in panes)
+
+
+def test_virtual_column_viewport_per_model(document):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, item_height=100, viewport_height=300, overscan=1)
+
+    model1 = column._get_root(document)
+    model2 = column._get_root(document)
+    document.add_root(model1)
+    document.add_root(model2)
+
+    # Scrolling in one browser only moves the window of its model
+    model1.scroll_top = 5000
+    for cb in list(document.session_callbacks):
+        cb.callback()
+    assert get_divs(model1.children[1:-1]) == divs[49:55]
+    assert get_divs(model2.children[1:-1]) == divs[:5]
+    assert column.scroll_top == 0
+
+    column._cleanup(model1)
+    assert model1.ref['id'] not in column._viewports
+
+
 def test_tabs_constructor(document, comm):
     div1 = Div()
     div2 = Div()
@@ -254,6 +410,63 @@ def test_tabs_pop(document, comm):
     assert p1._callbacks == {}
 
 
+def test_tabs_lazy(document, comm):
+    div1 = Div()
+    div2 = Div()
+    tabs = Tabs(div1, div2, lazy=True)
+    p1, p2 = tabs.objects
+
+    model = tabs._get_model(document, comm=comm)
+    tab1, tab2 = model.tabs
+    assert get_div(tab1.child) is div1
+    assert isinstance(tab2.child, BkSpacer)
+    assert p2._callbacks == {}
+
+    tabs.active = 1
+    assert get_div(tab2.child) is div2
+    assert tab2.child.ref['id'] in p2._callbacks
+    assert get_div(tab1.child) is div1
+
+
+def test_tabs_lazy_idle_release(document, comm):
+    div1 = Div()
+    div2 = Div()
+    tabs = Tabs(div1, div2, lazy=True, idle_timeout=0)
+    p1, p2 = tabs.objects
+
+    model = tabs._get_model(document, comm=comm)
+    tab1, tab2 = model.tabs
+
+    tabs.active = 1
+    assert isinstance(tab1.child, BkSpacer)
+    assert p1._callbacks == {}
+    assert get_div(tab2.child) is div2
+
+    tabs.active = 0
+    assert get_div(tab1.child) is div1
+    assert isinstance(tab2.child, BkSpacer)
+    assert p2._callbacks == {}
+
+
+def test_tabs_lazy_idle_release_single_callback(document):
+    tabs = Tabs(Div(), Div(), Div(), lazy=True, idle_timeout=60)
+
+    model = tabs._get_root(document)
+    document.add_root(model)
+
+    tabs.active = 1
+    tabs.active = 2
+    tabs.active = 0
+    timeouts = [cb for cb in document.session_callbacks
+                if isinstance(cb, TimeoutCallback)]
+    assert list(tabs._idle_callbacks.values()) == timeouts
+    assert len(timeouts) == 1
+
+    tabs._cleanup(model)
+    assert tabs._idle_callbacks == {}
+    assert timeouts[0] not in document.session_callbacks
+
+
 def test_spacer(document, comm):
 
     spacer = Spacer(width=400, height=300)
@@ -266,3 +479,12 @@ def test_spacer(document, comm):
 
     spacer.height = 400
     assert model.height == 400
+
+
+def test_layout_server_doc_includes_loading_css(document):
+    from bokeh.embed import file_html
+    from bokeh.resources import CDN
+
+    Row(Div()).server_doc(document)
+    html = file_html(document, CDN, template=document.template)
+    assert '.pn-loading' in html
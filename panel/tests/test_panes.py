@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 from base64 import b64decode, b64encode
+import param
 import pytest
 
 from bokeh.models import Div, Row as BkRow
@@ -35,6 +36,52 @@ def test_get_bokeh_pane_type():
     assert PaneBase.get_pane_type(div) is Bokeh
 
 
+def test_get_pane_type_cached():
+    from panel.pane import _pane_type_cache
+    assert PaneBase.get_pane_type('Some *markdown*') is Markdown
+    assert (str, None, False, False, False) in _pane_type_cache
+    assert PaneBase.get_pane_type('<svg></svg>') is SVG
+
+
+def test_get_pane_type_cache_invalidated_by_new_pane():
+    from panel.pane import _pane_type_cache
+    assert PaneBase.get_pane_type(1) is Str
+
+    class IntPane(PaneBase):
+
+        precedence = 1
+
+        @classmethod
+        def applies(cls, obj):
+            return isinstance(obj, int)
+
+    try:
+        assert PaneBase.get_pane_type(1) is IntPane
+    finally:
+        IntPane.precedence = None
+        IntPane.applies = classmethod(lambda cls, obj: False)
+        _pane_type_cache.clear()
+
+
+def test_get_pane_type_methods_not_cached():
+    from panel.param import ParamMethod
+
+    class Plain(object):
+        def method(self):
+            return 'A'
+
+    class Depends(param.Parameterized):
+
+        a = param.Integer(default=1)
+
+        @param.depends('a')
+        def view(self):
+            return self.a
+
+    assert PaneBase.get_pane_type(Plain().method) is Str
+    assert PaneBase.get_pane_type(Depends().view) is ParamMethod
+
+
 def test_bokeh_pane(document, comm):
     div = Div()
     pane = Pane(div)
@@ -10,8 +10,10 @@ from bokeh.models import (
 from panel.pane import Pane, PaneBase, Matplotlib, Bokeh
 from panel.layout import Tabs, Column, Row
 from panel.param import Param, ParamMethod, JSONInit
+from panel.widgets import DiscreteSlider, FloatSlider, Select as SelectWidget
 
 from .test_layout import get_div
+from .test_util import ManualExecutor, run_callbacks
 from .fixtures import mpl_figure
 
 try:
@@ -574,6 +576,99 @@ class View(param.Parameterized):
         return self.view() if (self.a % 2) else self.mpl_view()
 
 
+def test_param_lazy_sections(document, comm):
+
+    class Test(param.Parameterized):
+        a = param.Number(default=1.2, bounds=(0, 5), precedence=1)
+        b = param.Boolean(default=False, precedence=1)
+        c = param.String(default='A', precedence=2)
+
+    test = Test()
+    test_pane = Pane(test, lazy=True)
+    assert list(test_pane._widgets) == ['name']
+
+    model = test_pane._get_model(document, comm=comm)
+    box = model.children[0]
+    div, section1, section2 = box.children
+    assert isinstance(section1, Toggle)
+    assert section1.label == 'A ... B'
+    assert section2.label == 'C'
+
+    # Expand section
+    toggle = test_pane._widget_box.objects[1]
+    toggle.active = True
+    assert list(test_pane._widgets) == ['name', 'a', 'b']
+    widgets = test_pane._widgets['a'] + test_pane._widgets['b']
+    assert len(box.children) == 5
+    assert isinstance(box.children[2], Slider)
+    assert isinstance(box.children[3], CheckboxGroup)
+
+    # Widgets are linked to the parameters
+    test.a = 3.3
+    assert box.children[2].value == 3.3
+
+    # Collapse and re-expand reuses existing widgets
+    toggle.active = False
+    assert len(box.children) == 3
+    toggle.active = True
+    assert test_pane._widgets['a'] + test_pane._widgets['b'] == widgets
+    assert len(box.children) == 5
+
+
+def test_param_lazy_section_size(document, comm):
+
+    class Test(param.Parameterized):
+        a = param.Number(default=1.2, bounds=(0, 5))
+        b = param.Boolean(default=False)
+        c = param.String(default='A')
+
+    test_pane = Pane(Test(), lazy=True, section_size=2)
+    sections = test_pane._widget_box.objects[1:]
+    assert [s.name for s in sections] == ['A ... B', 'C']
+
+
+def test_param_plan_cached_per_class():
+
+    class Test(param.Parameterized):
+        a = param.Number(default=1.2, bounds=(0, 5))
+        b = param.Boolean(default=False)
+
+    pane1 = Pane(Test())
+    pane2 = Pane(Test())
+    assert pane1._plan is pane2._plan
+    assert isinstance(pane2._widgets['a'][0], FloatSlider)
+    assert pane2._widgets['a'][0].end == 5
+
+
+def test_param_plan_invalidated_by_metadata_change():
+
+    class Test(param.Parameterized):
+        a = param.Number(default=1.2, bounds=(0, 5), precedence=1)
+        b = param.Boolean(default=False, precedence=2)
+
+    Pane(Test())
+    Test.param.params('a').precedence = 3
+    pane = Pane(Test())
+    assert list(pane._widgets) == ['name', 'b', 'a']
+
+    Test.param.params('a').bounds = (0, 10)
+    assert Pane(Test())._widgets['a'][0].end == 10
+
+
+def test_param_plan_rebuilt_without_metadata_event():
+
+    class Test(param.Parameterized):
+        a = param.ObjectSelector(default='A', objects=['A', 'B'])
+
+    assert isinstance(Pane(Test())._widgets['a'][0], SelectWidget)
+
+    # In-place changes do not emit an event but alter the fingerprint
+    objects = Test.param.params('a').objects
+    objects[:] = [1, 2]
+    test = Test(a=1)
+    assert isinstance(Pane(test)._widgets['a'][0], DiscreteSlider)
+
+
 def test_get_param_method_pane_type():
     assert PaneBase.get_pane_type(View().view) is ParamMethod
 
@@ -708,6 +803,107 @@ def test_param_method_pane_changing_type(document, comm):
     assert new_pane._callbacks == {}
 
 
+def test_param_method_pane_cache(document, comm):
+    calls = []
+    class CachedView(param.Parameterized):
+
+        a = param.Integer(default=0)
+
+        @param.depends('a')
+        def view(self):
+            calls.append(self.a)
+            return Div(text='%d' % self.a)
+
+    test = CachedView()
+    pane = ParamMethod(test.view, cache_size=2)
+    row = pane._get_root(document, comm=comm)
+
+    test.a = 1
+    test.a = 0
+    assert calls == [0, 1]
+    assert get_div(row.children[0]).text == '0'
+    assert pane._cache.stats['hits'] == 1
+
+
+def test_param_method_pane_debounce(document):
+    calls = []
+    class DebouncedView(param.Parameterized):
+
+        a = param.Integer(default=0)
+
+        b = param.Integer(default=0)
+
+        @param.depends('a', 'b')
+        def view(self):
+            calls.append((self.a, self.b))
+            return Div(text='%d' % (self.a + self.b))
+
+    test = DebouncedView()
+    pane = ParamMethod(test.view, debounce=100)
+    pane._get_root(document)
+
+    test.a = 1
+    test.b = 2
+    test.a = 3
+    assert calls == [(0, 0)]
+    assert len(document.session_callbacks) == 1
+    document.session_callbacks[0].callback()
+    assert calls == [(0, 0), (3, 2)]
+
+
+def test_param_method_pane_executor(document):
+    executor = ManualExecutor()
+    test = View()
+    pane = ParamMethod(test.view, executor=executor)
+    row = pane._get_root(document)
+    model = row.children[0]
+
+    test.a = 1
+    test.a = 2
+    run_callbacks(document)
+    assert len(executor.submitted) == 1
+    assert model.css_classes == ['pn-loading']
+    assert get_div(row.children[0]).text == '0'
+
+    # Stale result is discarded and the latest call submitted
+    executor.run()
+    run_callbacks(document)
+    assert len(executor.submitted) == 1
+    assert get_div(row.children[0]).text == '0'
+
+    executor.run()
+    run_callbacks(document)
+    assert get_div(row.children[0]).text == '2'
+    assert 'pn-loading' not in model.css_classes
+
+
+def test_param_method_pane_executor_error(document):
+    class FailingView(param.Parameterized):
+
+        a = param.Integer(default=0)
+
+        @param.depends('a')
+        def view(self):
+            if self.a:
+                raise ValueError('Failed')
+            return Div(text='%d' % self.a)
+
+    executor = ManualExecutor()
+    test = FailingView()
+    pane = ParamMethod(test.view, executor=executor)
+    row = pane._get_root(document)
+    model = row.children[0]
+
+    test.a = 1
+    run_callbacks(document)
+    assert model.css_classes == ['pn-loading']
+
+    executor.run()
+    run_callbacks(document)
+    assert 'pn-loading' not in model.css_classes
+    assert get_div(row.children[0]).text == '0'
+
+
 def test_jsoninit_class_from_env_var():
     os.environ['PARAM_JSON_INIT'] = '{"a": 1}'
 
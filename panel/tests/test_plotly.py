@@ -10,6 +10,8 @@ except:
 plotly_available = pytest.mark.skipif(plotly is None, reason="requires plotly")
 
 import numpy as np
+from bokeh.document.events import (ColumnDataChangedEvent, ColumnsPatchedEvent,
+                                   ColumnsStreamedEvent)
 from bokeh.models import Row as BkRow
 from panel.pane import Pane, PaneBase
 from panel.plotly import Plotly, PlotlyPlot
@@ -46,11 +48,11 @@ def test_plotly_pane_single_trace(document, comm):
     model = row.children[0]
     assert isinstance(model, PlotlyPlot)
     assert model.ref['id'] in pane._callbacks
-    assert len(model.data['data']) == 1
-    assert model.data['data'][0]['type'] == 'scatter'
-    assert model.data['data'][0]['x'] == [0, 1]
-    assert model.data['data'][0]['y'] == [2, 3]
-    assert model.data['layout'] == {'width': 350}
+    assert len(model.data) == 1
+    assert model.data[0]['type'] == 'scatter'
+    assert model.data[0]['x'] == [0, 1]
+    assert model.data[0]['y'] == [2, 3]
+    assert model.layout == {'width': 350}
     assert len(model.data_sources) == 1
     assert model.data_sources[0].data == {}
 
@@ -58,11 +60,11 @@ def test_plotly_pane_single_trace(document, comm):
     new_trace = go.Bar(x=[2, 3], y=[4, 5])
     pane.object = new_trace
     assert row.children[0] is model
-    assert len(model.data['data']) == 1
-    assert model.data['data'][0]['type'] == 'bar'
-    assert model.data['data'][0]['x'] == [2, 3]
-    assert model.data['data'][0]['y'] == [4, 5]
-    assert model.data['layout'] == {'width': 350}
+    assert len(model.data) == 1
+    assert model.data[0]['type'] == 'bar'
+    assert model.data[0]['x'] == [2, 3]
+    assert model.data[0]['y'] == [4, 5]
+    assert model.layout == {'width': 350}
     assert len(model.data_sources) == 1
     assert model.data_sources[0].data == {}
     assert model.ref['id'] in pane._callbacks
@@ -84,11 +86,11 @@ def test_plotly_pane_numpy_to_cds_traces(document, comm):
     model = row.children[0]
     assert isinstance(model, PlotlyPlot)
     assert model.ref['id'] in pane._callbacks
-    assert len(model.data['data']) == 1
-    assert model.data['data'][0]['type'] == 'scatter'
-    assert 'x' not in model.data['data'][0]
-    assert 'y' not in model.data['data'][0]
-    assert model.data['layout'] == {'width': 350}
+    assert len(model.data) == 1
+    assert model.data[0]['type'] == 'scatter'
+    assert 'x' not in model.data[0]
+    assert 'y' not in model.data[0]
+    assert model.layout == {'width': 350}
     assert len(model.data_sources) == 1
     cds = model.data_sources[0]
     assert np.array_equal(cds.data['x'], np.array([1, 2]))
@@ -99,14 +101,14 @@ def test_plotly_pane_numpy_to_cds_traces(document, comm):
                  go.Bar(x=np.array([2, 3]), y=np.array([4, 5]))]
     pane.object = new_trace
     assert row.children[0] is model
-    assert len(model.data['data']) == 2
-    assert model.data['data'][0]['type'] == 'scatter'
-    assert 'x' not in model.data['data'][0]
-    assert 'y' not in model.data['data'][0]
-    assert model.data['data'][1]['type'] == 'bar'
-    assert 'x' not in model.data['data'][1]
-    assert 'y' not in model.data['data'][1]
-    assert model.data['layout'] == {'width': 350}
+    assert len(model.data) == 2
+    assert model.data[0]['type'] == 'scatter'
+    assert 'x' not in model.data[0]
+    assert 'y' not in model.data[0]
+    assert model.data[1]['type'] == 'bar'
+    assert 'x' not in model.data[1]
+    assert 'y' not in model.data[1]
+    assert model.layout == {'width': 350}
     assert len(model.data_sources) == 2
     cds = model.data_sources[0]
     assert np.array_equal(cds.data['x'], np.array([5, 6]))
@@ -119,3 +121,140 @@ def test_plotly_pane_numpy_to_cds_traces(document, comm):
     # Cleanup
     pane._cleanup(model, True)
     assert pane._callbacks == {}
+
+
+
+@plotly_available
+def test_plotly_pane_streams_appended_data(document, comm):
+    pane = Plotly(go.Scatter(x=np.arange(5), y=np.arange(5)))
+    row = pane._get_root(document, comm=comm)
+    document.add_root(row)
+    cds = row.children[0].data_sources[0]
+
+    events = []
+    document.on_change(lambda event: events.append(event))
+    pane.object = go.Scatter(x=np.arange(8), y=np.arange(8))
+
+    assert [type(e.hint) for e in events] == [ColumnsStreamedEvent]
+    assert np.array_equal(events[0].hint.data['x'], np.arange(5, 8))
+    assert np.array_equal(cds.data['x'], np.arange(8))
+    assert np.array_equal(cds.data['y'], np.arange(8))
+
+
+@plotly_available
+def test_plotly_pane_patches_changed_data(document, comm):
+    pane = Plotly(go.Scatter(x=np.arange(10), y=np.zeros(10)))
+    row = pane._get_root(document, comm=comm)
+    document.add_root(row)
+    cds = row.children[0].data_sources[0]
+
+    events = []
+    document.on_change(lambda event: events.append(event))
+    y = np.zeros(10)
+    y[2:4] = 1
+    pane.object = go.Scatter(x=np.arange(10), y=y)
+
+    assert [type(e.hint) for e in events] == [ColumnsPatchedEvent]
+    assert list(events[0].hint.patches) == ['y']
+    assert np.array_equal(cds.data['y'], y)
+
+    # Changing most values replaces the data entirely
+    events[:] = []
+    pane.object = go.Scatter(x=np.arange(10), y=np.ones(10))
+    assert [type(e.hint) for e in events] == [ColumnDataChangedEvent]
+    assert np.array_equal(cds.data['y'], np.ones(10))
+
+
+@plotly_available
+def test_plotly_pane_patch_does_not_modify_spec_arrays(document, comm):
+    y = np.zeros(10)
+    pane = Plotly({'data': [{'type': 'scatter', 'y': y}]})
+    row = pane._get_root(document, comm=comm)
+    document.add_root(row)
+    cds = row.children[0].data_sources[0]
+
+    events = []
+    document.on_change(lambda event: events.append(event))
+    new_y = np.zeros(10)
+    new_y[2] = 1
+    pane.object = {'data': [{'type': 'scatter', 'y': new_y}]}
+
+    assert [type(e.hint) for e in events] == [ColumnsPatchedEvent]
+    assert np.array_equal(cds.data['y'], new_y)
+    assert np.array_equal(y, np.zeros(10))
+
+
+@plotly_available
+def test_plotly_pane_nested_arrays_to_cds(document, comm):
+    trace = go.Scatter(x=np.array([1, 2]), y=np.array([2, 3]),
+                       marker=dict(color=np.array([0, 1]), size=np.array([5, 10])),
+                       error_y=dict(array=np.array([0.1, 0.2])))
+    pane = Plotly(trace)
+
+    row = pane._get_root(document, comm=comm)
+    model = row.children[0]
+    trace_json = model.data[0]
+    assert trace_json['marker'] == {}
+    assert trace_json['error_y'] == {}
+    cds = model.data_sources[0]
+    assert sorted(cds.data) == ['error_y.array', 'marker.color', 'marker.size', 'x', 'y']
+    assert np.array_equal(cds.data['marker.color'], np.array([0, 1]))
+    assert np.array_equal(cds.data['error_y.array'], np.array([0.1, 0.2]))
+
+
+@plotly_available
+def test_get_plotly_pane_type_from_dict():
+    spec = {'data': [{'type': 'scatter', 'x': [0, 1], 'y': [2, 3]}],
+            'layout': {'width': 350}}
+    assert PaneBase.get_pane_type(spec) is Plotly
+    assert PaneBase.get_pane_type(spec['data']) is Plotly
+    assert PaneBase.get_pane_type({'a': 1}) is not Plotly
+
+
+@plotly_available
+def test_plotly_pane_dict_spec(document, comm):
+    spec = {'data': [{'type': 'scatter', 'x': np.array([0, 1]),
+                      'marker': {'color': np.array([2, 3])}}],
+            'layout': {'width': 350}}
+    pane = Pane(spec)
+
+    row = pane._get_root(document, comm=comm)
+    model = row.children[0]
+    assert model.data == [{'type': 'scatter', 'marker': {}}]
+    assert model.layout == {'width': 350}
+    cds = model.data_sources[0]
+    assert np.array_equal(cds.data['x'], np.array([0, 1]))
+    assert np.array_equal(cds.data['marker.color'], np.array([2, 3]))
+
+    # The original spec is not modified
+    assert 'x' in spec['data'][0]
+    assert 'color' in spec['data'][0]['marker']
+
+    pane.object = {'data': [{'type': 'bar', 'x': np.array([1, 2])}]}
+    assert model.data == [{'type': 'bar'}]
+    assert model.layout == {}
+    assert np.array_equal(cds.data['x'], np.array([1, 2]))
+
+
+@plotly_available
+def test_plotly_pane_layout_update(document, comm):
+    pane = Plotly(go.Scatter(x=np.arange(3), y=np.arange(3)), layout={'width': 350})
+    row = pane._get_root(document, comm=comm)
+    document.add_root(row)
+    model = row.children[0]
+
+    events = []
+    document.on_change(lambda event: events.append(event))
+    pane.layout = {'width': 500}
+
+    assert model.layout == {'width': 500}
+    assert [(e.model, e.attr) for e in events] == [(model, 'layout')]
+
+    # Updating the data does not resend the unchanged layout
+    events[:] = []
+    pane.object = go.Scatter(x=np.arange(3), y=np.arange(3)+1)
+    assert all(e.model is not model or e.attr != 'layout' for e in events)
+
+    # Cleanup removes both the object and layout watchers
+    pane._cleanup(model)
+    assert pane._callbacks == {}
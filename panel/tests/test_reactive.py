@@ -101,3 +101,97 @@ def test_link_properties_server(document):
     assert isinstance(cb, partial)
     assert cb.args == (document,)
     assert cb.func == obj._server_change
+
+
+def test_link_params_server_combines_updates(document):
+
+    class ReactiveLink(Reactive):
+
+        text = param.String(default='A')
+
+        width = param.Integer(default=100)
+
+    obj = ReactiveLink()
+    div = Div()
+
+    obj._link_params(div, ['text', 'width'], document, None)
+
+    # Multiple events are queued in a single next tick callback
+    obj.text = 'B'
+    obj.set_param(text='C', width=200)
+    callbacks = document.session_callbacks
+    assert len(callbacks) == 1
+    assert div.text == ''
+
+    callbacks[0].callback()
+    assert div.text == 'C'
+    assert div.width == 200
+    assert document not in Reactive._pending_updates
+
+
+def test_hold_link_params_nb(document, comm):
+
+    class ReactiveLink(Reactive):
+
+        text = param.String(default='A')
+
+    obj = ReactiveLink()
+    div = Div()
+    obj._link_params(div, ['text'], document, None, comm)
+
+    with obj.hold():
+        obj.text = 'B'
+        obj.text = 'C'
+        assert div.text == ''
+    assert div.text == 'C'
+
+
+def test_link_params_nb_combines_pushes_in_hold(document, comm, monkeypatch):
+
+    class ReactiveLink(Reactive):
+
+        text = param.String(default='A')
+
+    pushes = []
+    monkeypatch.setattr('panel.viewable.push', lambda doc, comm: pushes.append(doc))
+
+    obj = ReactiveLink()
+    div1, div2 = Div(), Div()
+    obj._link_params(div1, ['text'], document, None, comm)
+    obj._link_params(div2, ['text'], document, None, comm)
+
+    # Outside a hold each watcher pushes immediately
+    obj.text = 'B'
+    assert div1.text == div2.text == 'B'
+    assert pushes == [document, document]
+
+    # Inside a hold the watchers make a single push
+    pushes[:] = []
+    with obj.hold():
+        obj.text = 'C'
+        obj.text = 'D'
+        assert pushes == []
+    assert div1.text == div2.text == 'D'
+    assert pushes == [document]
+
+
+def test_link_params_nb_push_from_thread(document, comm, monkeypatch):
+    import threading
+
+    class ReactiveLink(Reactive):
+
+        text = param.String(default='A')
+
+    pushes = []
+    monkeypatch.setattr('panel.viewable.push', lambda doc, comm: pushes.append(doc))
+
+    obj = ReactiveLink()
+    div = Div()
+    obj._link_params(div, ['text'], document, None, comm)
+
+    thread = threading.Thread(target=lambda: setattr(obj, 'text', 'B'))
+    thread.start()
+    thread.join()
+    obj.text = 'C'
+    assert div.text == 'C'
+    assert pushes == [document, document]
@@ -1,7 +1,15 @@
-from bokeh.models import Div
+import json
+
+import pytest
+
+from concurrent.futures import Future
+
+from bokeh.models import Div, ColumnDataSource, Row as BkRow
 
 from panel.pane import PaneBase
-from panel.util import render_mimebundle, default_label_formatter, get_method_owner
+from panel.util import (render_mimebundle, default_label_formatter,
+                        get_method_owner, diff, LatestCall,
+                        LRUCache, model_spec, models_from_spec)
 
 
 def test_get_method_owner_class():
@@ -38,3 +46,145 @@ def test_default_label_formatter_not_replace_underscores():
 
 def test_default_label_formatter_overrides():
     assert default_label_formatter.instance(overrides={'a': 'b'})('a') == 'b'
+
+
+def test_diff_compacts_model_changes(document):
+    div = Div()
+    document.add_root(div)
+    document.hold('collect')
+    for i in range(10):
+        div.text = str(i)
+    div.width = 100
+
+    msg = diff(document)
+    events = json.loads(msg.content_json)['events']
+    assert [(e['attr'], e['new']) for e in events] == [('text', '9'), ('width', 100)]
+    assert document._held_events == []
+
+
+def test_diff_drops_obsolete_stream(document):
+    cds = ColumnDataSource(data={'x': [1, 2]})
+    document.add_root(cds)
+    document.hold('collect')
+    cds.stream({'x': [3]})
+    cds.data = {'x': [4, 5, 6]}
+
+    msg = diff(document)
+    events = json.loads(msg.content_json)['events']
+    assert len(events) == 1
+    assert events[0]['kind'] == 'ColumnDataChanged'
+
+
+def test_diff_drops_events_on_detached_models(document):
+    row = BkRow()
+    document.add_root(row)
+    document.hold('collect')
+    div = Div()
+    row.children = [div]
+    div.text = 'x'
+    row.children = [Div()]
+
+    msg = diff(document)
+    content = json.loads(msg.content_json)
+    ids = [e['model']['id'] for e in content['events']]
+    assert ids == [row.ref['id']]
+    assert div.ref['id'] not in [r['id'] for r in content['references']]
+
+
+def test_models_from_spec():
+    source = ColumnDataSource(data={'x': [1, 2, 3]})
+    spec = model_spec(source)
+    clone1 = models_from_spec(spec)
+    clone2 = models_from_spec(spec)
+    assert clone1.data == {'x': [1, 2, 3]}
+    assert len({source.ref['id'], clone1.ref['id'], clone2.ref['id']}) == 3
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_items=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.stats == {'hits': 1, 'misses': 1, 'hit_rate': 0.5,
+                           'items': 2, 'bytes': 0}
+
+
+def test_lru_cache_max_bytes():
+    np = pytest.importorskip('numpy')
+    cache = LRUCache(max_items=10, max_bytes=1000)
+    cache['a'] = np.zeros(100)
+    cache['b'] = np.zeros(100)
+    assert 'a' not in cache
+    assert cache.stats['bytes'] == 800
+    cache['c'] = np.zeros(200)
+    assert 'c' not in cache
+
+
+class ManualExecutor(object):
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.submitted.append((future, fn, args, kwargs))
+        return future
+
+    def run(self):
+        future, fn, args, kwargs = self.submitted.pop(0)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+
+def run_callbacks(document, once=False):
+    """
+    Runs the callbacks scheduled on the document, including those
+    scheduled while running them unless once is set.
+    """
+    while document.session_callbacks:
+        for cb in list(document.session_callbacks):
+            cb.callback()
+        if once:
+            break
+
+
+def test_latest_call_drops_stale_results():
+    executor = ManualExecutor()
+    results = []
+    call = LatestCall(executor, results.append, lambda cb: cb())
+
+    call(lambda x: x, 1)
+    call(lambda x: x, 2)
+    call(lambda x: x, 3)
+    assert len(executor.submitted) == 1
+
+    executor.run()
+    assert results == []
+    assert len(executor.submitted) == 1
+    assert executor.submitted[0][2] == (3,)
+
+    executor.run()
+    assert results == [3]
+    assert executor.submitted == []
+
+
+def test_latest_call_passes_exception_to_error_callback():
+    executor = ManualExecutor()
+    results, errors = [], []
+    call = LatestCall(executor, results.append, lambda cb: cb(), errors.append)
+
+    def fail():
+        raise ValueError('Failed')
+
+    call(fail)
+    executor.run()
+    assert results == []
+    assert len(errors) == 1
+    assert isinstance(errors[0], ValueError)
@@ -11,7 +11,7 @@ altair_available = pytest.mark.skipif(alt is None, reason="requires altair")
 import numpy as np
 from bokeh.models import Row as BkRow
 from panel.pane import Pane, PaneBase
-from panel.vega import Vega, VegaPlot
+from panel.vega import Vega, VegaPlot, ds_as_cds, encode_strings
 
 vega_example = {
     'config': {'view': {'width': 400, 'height': 300}},
@@ -60,6 +60,75 @@ def test_vega_pane(document, comm):
     assert pane._callbacks == {}
 
 
+def test_ds_as_cds_compact_dtypes():
+    dataset = [{'i': i, 'f': i/2., 'g': i/3., 'b': i % 2 == 0, 's': 'A'}
+               for i in range(4)]
+    data = ds_as_cds(dataset)
+    assert data['i'].dtype == np.int32
+    assert data['f'].dtype == np.float32
+    assert data['g'].dtype == np.float64
+    assert data['b'].dtype == np.bool_
+    assert np.array_equal(data['g'], np.arange(4)/3.)
+    assert list(data['s']) == ['A']*4
+
+
+def test_ds_as_cds_uneven_records():
+    dataset = [{'x': 1, 'y': 'A'}, {'x': 2}, {'x': 3, 'z': 0.5}]
+    data = ds_as_cds(dataset)
+    assert sorted(data) == ['x', 'y', 'z']
+    assert list(data['x']) == [1, 2, 3]
+    assert list(data['y']) == ['A', None, None]
+    assert data['z'][2] == 0.5
+    assert np.isnan(data['z'][:2]).all()
+
+
+def test_encode_strings():
+    data = {'s': np.array(['A', 'B', 'A', 'A', None], dtype=object),
+            'u': np.array(['A', 'B', 'C', 'D'], dtype=object),
+            'x': np.arange(4)}
+    encoded, categories = encode_strings(data)
+    assert categories == {'s': ['A', 'B']}
+    assert encoded['s'].dtype == np.int8
+    assert list(encoded['s']) == [0, 1, 0, 0, -1]
+    assert encoded['u'] is data['u']
+    assert encoded['x'] is data['x']
+
+
+def test_vega_pane_encodes_repeated_strings(document, comm):
+    values = [{'x': 'AB'[i % 2], 'y': i} for i in range(10)]
+    example = dict(vega_example, data={'values': values})
+    pane = Pane(example)
+
+    row = pane._get_root(document, comm=comm)
+    model = row.children[0]
+    assert model.categories == {'data': {'x': ['A', 'B']}}
+    cds_data = model.data_sources['data'].data
+    assert list(cds_data['x']) == [0, 1]*5
+    assert np.array_equal(cds_data['y'], np.arange(10))
+
+    values = [{'x': c, 'y': i} for i, c in enumerate('ABCDE')]
+    pane.object = dict(vega_example, data={'values': values})
+    assert model.categories == {'data': {}}
+    cds_data = model.data_sources['data'].data
+    assert np.array_equal(cds_data['x'], np.array(['A', 'B', 'C', 'D', 'E']))
+
+
+def test_vega_pane_updates_named_dataset(document, comm):
+    example = dict(vega_example, data={'name': 'table'},
+                   datasets={'table': [{'x': 'AB'[i % 2]} for i in range(10)]})
+    pane = Pane(example)
+
+    row = pane._get_root(document, comm=comm)
+    model = row.children[0]
+    cds = model.data_sources['table']
+    assert model.categories['table'] == {'x': ['A', 'B']}
+
+    pane.object = dict(example, datasets={'table': [{'x': 'BC'[i % 2]} for i in range(10)]})
+    assert model.data_sources['table'] is cds
+    assert model.categories['table'] == {'x': ['B', 'C']}
+    assert list(cds.data['x']) == [0, 1]*5
+
+
 def altair_example():
     import altair as alt
     data = alt.Data(values=[{'x': 'A', 'y': 5},
@@ -72,6 +72,48 @@ def test_float_slider(document, comm):
     assert widget.value == 0.3
 
 
+def test_float_slider_value_throttled(document, comm):
+
+    slider = FloatSlider(start=0.1, end=0.5, value=0.4, throttle=1000)
+
+    box = slider._get_model(document, comm=comm)
+    widget = box.children[0]
+
+    assert slider.value_throttled == 0.4
+    assert 'throttled' not in widget.properties_with_values()
+
+    slider._comm_change({'value': 0.2})
+    slider._comm_change({'value': 0.3})
+    assert slider.value == 0.3
+    assert slider.value_throttled == 0.2
+
+    slider._trailing_edge()
+    assert slider.value_throttled == 0.3
+
+    slider.value = 0.1
+    assert slider.value_throttled == 0.1
+
+
+def test_float_slider_throttled(document, comm):
+
+    slider = FloatSlider(start=0.1, end=0.5, value=0.4, throttled=True,
+                         throttle=1000)
+
+    box = slider._get_model(document, comm=comm)
+    widget = box.children[0]
+
+    slider._comm_change({'value': 0.2})
+    assert slider.value == 0.2
+
+    slider._comm_change({'value': 0.3})
+    assert slider.value == 0.2
+    assert widget.value == 0.4
+
+    slider._trailing_edge()
+    assert slider.value == 0.3
+    assert slider.value_throttled == 0.3
+
+
 def test_int_slider(document, comm):
 
     slider = IntSlider(start=0, end=3, value=1, name='Slider')
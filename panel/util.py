@@ -5,8 +5,10 @@ import sys
 import inspect
 import numbers
 
-from collections import defaultdict, MutableSequence, MutableMapping
+from collections import (defaultdict, MutableSequence, MutableMapping,
+                         OrderedDict)
 from datetime import datetime
+from functools import partial
 
 import param
 import bokeh
@@ -14,8 +16,14 @@ import bokeh.embed.notebook
 from bokeh.io.notebook import load_notebook as bk_load_notebook
 from bokeh.models import (Model, LayoutDOM, Div as BkDiv, Row as BkRow,
                           Spacer as BkSpacer)
+from bokeh.document.util import (initialize_references_json,
+                                 instantiate_references_json, references_json)
+from bokeh.document.events import (ModelChangedEvent, ColumnDataChangedEvent,
+                                   TitleChangedEvent)
+from bokeh.core.json_encoder import serialize_json
 from bokeh.protocol import Protocol
 from bokeh.resources import CDN, INLINE
+from bokeh.util.serialization import make_id
 from bokeh.util.string import encode_utf8
 from pyviz_comms import (PYVIZ_PROXY, JupyterCommManager, bokeh_msg_handler,
                          nb_mime_js, embed_js)
@@ -122,6 +130,176 @@ def Div(**kwargs):
     return div
 
 
+def compact_events(events, doc=None):
+    """
+    Compacts a list of document events before they are sent. Repeated
+    ModelChanged events for the same (model, attr) pair are merged into
+    the latest change and stream or patch events are dropped if a
+    later event replaces the data on the same source entirely. The
+    order of the surviving events is preserved.
+
+    If a document is supplied, events on models which are no longer
+    attached to it are dropped, since the dropped events may have been
+    the only ones introducing those models to the client.
+    """
+    replaced = set()
+    compacted = []
+    for event in reversed(events):
+        if isinstance(event, TitleChangedEvent):
+            key = (None, 'title')
+            if key in replaced:
+                continue
+            replaced.add(key)
+        elif isinstance(event, ModelChangedEvent):
+            model_id = event.model.ref['id']
+            if (model_id, event.attr) in replaced:
+                continue
+            if doc is not None and doc.get_model_by_id(model_id) is None:
+                continue
+            hint = event.hint
+            if hint is None or (isinstance(hint, ColumnDataChangedEvent)
+                                and hint.cols is None):
+                replaced.add((model_id, event.attr))
+        compacted.append(event)
+    return compacted[::-1]
+
+
+def nbytes(obj):
+    """
+    Estimates the memory used by an object, using the nbytes of
+    arrays and the deep memory usage of pandas objects and falling
+    back to sys.getsizeof otherwise.
+    """
+    if hasattr(obj, 'memory_usage'):
+        try:
+            usage = obj.memory_usage(deep=True)
+            return int(getattr(usage, 'sum', lambda: usage)())
+        except Exception:
+            pass
+    size = getattr(obj, 'nbytes', None)
+    if isinstance(size, numbers.Integral):
+        return int(size)
+    return sys.getsizeof(obj)
+
+
+class LRUCache(object):
+    """
+    A least recently used cache bounded by the number of items and
+    optionally by the estimated number of bytes it holds. Records the
+    number of hits and misses to report the hit rate.
+    """
+
+    def __init__(self, max_items=128, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            self.misses += 1
+            return default
+        self.hits += 1
+        value = self._data.pop(key)
+        self._data[key] = value
+        return value[0]
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self._bytes -= self._data.pop(key)[1]
+        size = nbytes(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._data[key] = (value, size)
+        self._bytes += size
+        while len(self._data) > self.max_items or (
+                self.max_bytes is not None and self._bytes > self.max_bytes):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self._bytes -= evicted
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+        self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits/float(total) if total else 0,
+                'items': len(self._data), 'bytes': self._bytes}
+
+
+class LatestCall(object):
+    """
+    Evaluates functions on an executor (e.g. a thread or process pool)
+    keeping at most one call in flight. Calls requested while another
+    call is running replace any call still waiting to be submitted and
+    only the result of the most recently requested call is passed to
+    the callback; stale results are dropped. If the latest call raises
+    the exception is passed to the error callback, or re-raised if
+    none was supplied. The schedule function must hand a callback to
+    the event loop in a thread-safe way, e.g.
+    Document.add_next_tick_callback or IOLoop.add_callback.
+    """
+
+    def __init__(self, executor, callback, schedule, error=None):
+        self.executor = executor
+        self.callback = callback
+        self.schedule = schedule
+        self.error = error
+        self._requested = 0
+        self._future = None
+        self._pending = None
+
+    def __call__(self, fn, *args, **kwargs):
+        self._requested += 1
+        self._pending = (self._requested, fn, args, kwargs)
+        if self._future is None:
+            self._submit()
+
+    def set_result(self, result):
+        """
+        Delivers a result which is already available (e.g. cached),
+        superseding any call which is queued or in flight.
+        """
+        self._requested += 1
+        self._pending = None
+        self.callback(result)
+
+    def _submit(self):
+        token, fn, args, kwargs = self._pending
+        self._pending = None
+        self._future = self.executor.submit(fn, *args, **kwargs)
+        self._future.add_done_callback(partial(self._done, token))
+
+    def _done(self, token, future):
+        # Called on the executor thread, defer to the event loop
+        self.schedule(partial(self._resolve, token, future))
+
+    def _resolve(self, token, future):
+        self._future = None
+        if self._pending is not None:
+            self._submit()
+        elif token == self._requested:
+            try:
+                result = future.result()
+            except Exception as e:
+                if self.error is None:
+                    raise
+                self.error(e)
+            else:
+                self.callback(result)
+
+
 def diff(doc, binary=True, events=None):
     """
     Returns a json diff required to update an existing plot with
@@ -130,8 +308,10 @@ def diff(doc, binary=True, events=None):
     events = list(doc._held_events) if events is None else events
     if not events:
         return None
-    msg = Protocol("1.0").create("PATCH-DOC", events, use_buffers=binary)
-    doc._held_events = [e for e in doc._held_events if e not in events]
+    msg = Protocol("1.0").create("PATCH-DOC", compact_events(events, doc),
+                                 use_buffers=binary)
+    consumed = set(id(e) for e in events)
+    doc._held_events = [e for e in doc._held_events if id(e) not in consumed]
     return msg
 
 
@@ -150,6 +330,41 @@ def push(doc, comm, binary=True):
         comm.send(buffers=[payload])
 
 
+def model_spec(model):
+    """
+    Returns a JSON serializable specification of a bokeh model and all
+    the models it references, which may be instantiated any number of
+    times using models_from_spec.
+    """
+    spec = {'root': model.ref['id'],
+            'references': references_json(model.references())}
+    return json.loads(serialize_json(spec))
+
+
+def _remap_ids(obj, ids):
+    if isinstance(obj, dict):
+        remapped = {k: _remap_ids(v, ids) for k, v in obj.items()}
+        if 'type' in obj and obj.get('id') in ids:
+            remapped['id'] = ids[obj['id']]
+        return remapped
+    elif isinstance(obj, list):
+        return [_remap_ids(v, ids) for v in obj]
+    return obj
+
+
+def models_from_spec(spec):
+    """
+    Instantiates a copy of the models described by a specification
+    returned by model_spec, assigning new ids to all models, and
+    returns the root model.
+    """
+    ids = {ref['id']: make_id() for ref in spec['references']}
+    refs_json = _remap_ids(spec['references'], ids)
+    references = instantiate_references_json(refs_json)
+    initialize_references_json(refs_json, references)
+    return references[ids[spec['root']]]
+
+
 def remove_root(obj, replace=None):
     """
     Removes the document from any previously displayed bokeh object
@@ -177,6 +392,33 @@ def add_to_doc(obj, doc, hold=False):
 LOAD_MIME = 'application/vnd.holoviews_load.v0+json'
 EXEC_MIME = 'application/vnd.holoviews_exec.v0+json'
 
+# Styles applied by panel, e.g. to outputs which are being recomputed
+CSS = """
+.pn-loading {
+  position: relative;
+}
+.pn-loading:after {
+  content: '';
+  position: absolute;
+  top: 0;
+  left: 0;
+  width: 100%;
+  height: 100%;
+  z-index: 1000;
+  cursor: progress;
+  background-color: rgba(255, 255, 255, 0.5);
+}
+"""
+
+# Extends the default bokeh page template to include the panel CSS in
+# documents served by the bokeh server
+SERVER_TEMPLATE = """
+{% block postamble %}
+{{ super() }}
+<style>""" + CSS + """</style>
+{% endblock %}
+"""
+
 
 def load_notebook(inline=True):
     from IPython.display import publish_display_data
@@ -191,6 +433,7 @@ def load_notebook(inline=True):
     # Publish comm manager
     JS = '\n'.join([PYVIZ_PROXY, JupyterCommManager.js_manager, nb_mime_js])
     publish_display_data(data={LOAD_MIME: JS, 'application/javascript': JS})
+    publish_display_data(data={'text/html': '<style>%s</style>' % CSS})
 
 
 def render_mimebundle(model, doc, comm):
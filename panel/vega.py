@@ -2,26 +2,106 @@ from __future__ import division, absolute_import
 
 import os
 import sys
+from collections import OrderedDict
 
 import numpy as np
-from bokeh.core.properties import Dict, String, Any, Instance
+from bokeh.core.properties import Dict, String, Any, Instance, List
 from bokeh.models import LayoutDOM, ColumnDataSource
 
 from .pane import PaneBase
 
 
+def _compact_array(values):
+    """
+    Downcasts 64-bit integer and float arrays to 32-bit types if this
+    can be done without loss of precision.
+    """
+    if not len(values) or values.dtype.itemsize <= 4:
+        return values
+    kind = values.dtype.kind
+    if kind == 'i':
+        info = np.iinfo(np.int32)
+        if values.min() >= info.min and values.max() <= info.max:
+            return values.astype(np.int32)
+    elif kind == 'f':
+        compact = values.astype(np.float32)
+        if ((compact == values) | np.isnan(values)).all():
+            return compact
+    return values
+
+
+def _dataset_columns(dataset):
+    """
+    Returns the union of the keys of all records in a Vega dataset,
+    in the order they first appear.
+    """
+    return list(OrderedDict((k, None) for item in dataset for k in item))
+
+
 def ds_as_cds(dataset):
     """
-    Converts Vega dataset into Bokeh ColumnDataSource data
+    Converts Vega dataset into Bokeh ColumnDataSource data, inferring
+    compact dtypes for each column. Records may have different keys,
+    missing values are filled with None (or NaN for numeric columns).
     """
     if len(dataset) == 0:
         return {}
-    data = {k: [] for k, v in dataset[0].items()}
-    for item in dataset:
-        for k, v in item.items():
-            data[k].append(v)
-    data = {k: np.asarray(v) for k, v in data.items()}
-    return data
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        # Let pandas infer missing numeric values and datetimes
+        df = pd.DataFrame.from_records(dataset, columns=_dataset_columns(dataset))
+        data = {}
+        for k in df.columns:
+            values = df[k].values
+            if values.dtype.kind == 'O':
+                values = df[k].where(df[k].notnull(), None).values
+            data[k] = _compact_array(values)
+        return data
+    return {k: _compact_array(np.asarray([item.get(k) for item in dataset]))
+            for k in _dataset_columns(dataset)}
+
+
+def encode_strings(data, max_ratio=0.5):
+    """
+    Dictionary-encodes string columns in the ColumnDataSource data,
+    replacing them with integer codes if the number of unique values
+    is at most max_ratio times the length of the column. Returns the
+    encoded data and a dictionary of the categories for each encoded
+    column, where missing values are encoded as -1.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    encoded, categories = {}, {}
+    for k, values in data.items():
+        values = np.asarray(values)
+        if values.dtype.kind not in 'OU' or values.ndim != 1 or not len(values):
+            encoded[k] = values
+            continue
+        if pd is not None:
+            if (values.dtype.kind == 'O' and
+                pd.api.types.infer_dtype(values, skipna=True) != 'string'):
+                encoded[k] = values
+                continue
+            codes, uniques = pd.factorize(values)
+        elif values.dtype.kind == 'U':
+            uniques, codes = np.unique(values, return_inverse=True)
+        else:
+            encoded[k] = values
+            continue
+        if len(uniques) > max_ratio*len(values):
+            encoded[k] = values
+            continue
+        for dtype in (np.int8, np.int16, np.int32):
+            if len(uniques) <= np.iinfo(dtype).max:
+                break
+        encoded[k] = codes.astype(dtype)
+        categories[k] = [str(u) for u in uniques]
+    return encoded, categories
 
 
 class VegaPlot(LayoutDOM):
@@ -36,6 +116,10 @@ class VegaPlot(LayoutDOM):
 
     data_sources = Dict(String, Instance(ColumnDataSource))
 
+    categories = Dict(String, Dict(String, List(String)), help="""
+        The categories of dictionary-encoded string columns in each
+        data source, indexed by the integer codes in the column.""")
+
 
 class Vega(PaneBase):
     """
@@ -74,11 +158,16 @@ class Vega(PaneBase):
             return json
         return obj.to_dict()
 
-    def _get_sources(self, json, sources):
+    @staticmethod
+    def _set_source(sources, name, data):
+        if name in sources:
+            sources[name].data = data
+        else:
+            sources[name] = ColumnDataSource(data=data)
+
+    def _get_sources(self, json, sources, categories):
         for name, data in json.pop('datasets', {}).items():
-            if name in sources:
-                continue
-            columns = set(data[0]) if data else []
+            columns = set(_dataset_columns(data))
             if self.is_altair(self.object):
                 import altair as alt
                 if (not isinstance(self.object.data, alt.Data) and
@@ -86,12 +175,14 @@ class Vega(PaneBase):
                     data = ColumnDataSource.from_df(self.object.data)
                 else:
                     data = ds_as_cds(data)
-                sources[name] = ColumnDataSource(data=data)
             else:
-                sources[name] = ColumnDataSource(data=ds_as_cds(data))
+                data = ds_as_cds(data)
+            data, categories[name] = encode_strings(data)
+            self._set_source(sources, name, data)
         data = json.get('data', {}).pop('values', {})
         if data:
-            sources['data'] = ColumnDataSource(data=ds_as_cds(data))
+            data, categories['data'] = encode_strings(ds_as_cds(data))
+            self._set_source(sources, 'data', data)
 
     def _get_model(self, doc, root, parent=None, comm=None):
         """
@@ -99,13 +190,16 @@ class Vega(PaneBase):
         """
         json = self._to_json(self.object)
         json['data'] = dict(json['data'])
-        sources = {}
-        self._get_sources(json, sources)
-        model = VegaPlot(data=json, data_sources=sources)
+        sources, categories = {}, {}
+        self._get_sources(json, sources, categories)
+        model = VegaPlot(data=json, data_sources=sources,
+                         categories=categories)
         self._link_object(model, doc, root, parent, comm)
         return model
 
     def _update(self, model):
         json = self._to_json(self.object)
-        self._get_sources(json, model.data_sources)
+        categories = {}
+        self._get_sources(json, model.data_sources, categories)
+        model.categories = categories
         model.data = json
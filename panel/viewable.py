@@ -8,20 +8,23 @@ from __future__ import absolute_import
 
 import re
 import signal
+import weakref
+from contextlib import contextmanager
 from functools import partial
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 import param
 
 from bokeh.application.handlers import FunctionHandler
 from bokeh.application import Application
+from bokeh.core.templates import FILE
 from bokeh.document import Document
 from bokeh.io import curdoc, show
 from bokeh.models import CustomJS
 from bokeh.server.server import Server
 from pyviz_comms import JS_CALLBACK, CommManager, JupyterCommManager
 
-from .util import render_mimebundle, add_to_doc, push
+from .util import SERVER_TEMPLATE, render_mimebundle, add_to_doc, push
 
 
 class Viewable(param.Parameterized):
@@ -132,6 +135,8 @@ class Viewable(param.Parameterized):
         doc = doc or curdoc()
         if title is not None:
             doc.title = title
+        if doc.template is FILE:
+            doc.template = SERVER_TEMPLATE
         model = self._get_root(doc)
         if hasattr(doc, 'on_session_destroyed'):
             doc.on_session_destroyed(self._server_destroy)
@@ -240,15 +245,71 @@ class Reactive(Viewable):
     # Mapping from parameter name to bokeh model property name
     _rename = {}
 
+    # Model updates queued per Document, applied on the next tick
+    _pending_updates = weakref.WeakKeyDictionary()
+
     def __init__(self, **params):
         # temporary flag denotes panes created for temporary, internal
         # use which should be garbage collected once they have been used
         self._temporary = params.pop('_temporary', False)
+        # optional key identifying the object when reconciling the
+        # children of a layout, a matching previously rendered object
+        # with the same key replaces this object in the layout
+        self._key = params.pop('key', None)
         super(Reactive, self).__init__(**params)
         self._active = []
         self._events = {}
         self._expecting = []
         self._callbacks = defaultdict(list)
+        self._held = None
+        self._deferred_pushes = None
+
+    @contextmanager
+    def hold(self):
+        """
+        Context manager which suspends updates to the linked bokeh
+        models. Parameter changes made inside the block are collected
+        and, when the block exits, applied as a single reconciled
+        update per model followed by a single push per document.
+
+        >>> with layout.hold():
+        ...     for obj in objects:
+        ...         layout.append(obj)
+        """
+        if self._held is not None:
+            yield
+            return
+        self._held = OrderedDict()
+        try:
+            yield
+        finally:
+            held, self._held = self._held, None
+            self._deferred_pushes = OrderedDict()
+            try:
+                for fn, events in held.values():
+                    fn(*events.values())
+            finally:
+                pushes, self._deferred_pushes = self._deferred_pushes, None
+                for doc, comm in pushes.values():
+                    push(doc, comm)
+
+    def _holdable(self, fn):
+        """
+        Wraps a watcher callback so that while the object is held
+        events are collected instead of being processed. Multiple
+        events for the same parameter are merged into a single event
+        holding the original old value and the latest new value.
+        """
+        def wrapper(*events):
+            if self._held is None:
+                return fn(*events)
+            _, held = self._held.setdefault(fn, (fn, OrderedDict()))
+            for event in events:
+                key = (id(event.obj or event.cls), event.name, event.what)
+                if key in held:
+                    event = event._replace(old=held[key].old)
+                held[key] = event
+        return wrapper
 
     def link(self, obj, **links):
         """
@@ -320,30 +381,71 @@ class Reactive(Viewable):
         """
         return {self._rename.get(k, k): v for k, v in msg.items()}
 
+    def _update_models(self, doc, updates, comm=None):
+        """
+        Applies a list of (model, msg) property updates. In the notebook
+        the models are updated and pushed immediately, so updates made
+        in a loop inside a cell are displayed live; use hold() to
+        combine the updates into a single push. On bokeh server all updates queued on a document
+        within one tick are merged and applied in a single next tick
+        callback, making one model.update call per model.
+        """
+        if comm:
+            for model, msg in updates:
+                model.update(**msg)
+            self._push(doc, comm)
+            return
+
+        pending = self._pending_updates.get(doc)
+        if pending is None:
+            pending = self._pending_updates[doc] = OrderedDict()
+            doc.add_next_tick_callback(partial(self._flush_updates, doc))
+        for model, msg in updates:
+            ref = model.ref['id']
+            if ref in pending:
+                pending[ref][1].update(msg)
+            else:
+                pending[ref] = (model, dict(msg))
+
+    def _push(self, doc, comm):
+        """
+        Pushes the document across the comm, unless a hold is being
+        released in which case a single push per document is made
+        once all held watchers have been processed. Pushes are made
+        synchronously rather than scheduled on an IOLoop, since the
+        kernel IOLoop does not run while a cell is executing and
+        cannot be reached from a background thread.
+        """
+        if self._deferred_pushes is not None:
+            self._deferred_pushes[id(doc)] = (doc, comm)
+        else:
+            push(doc, comm)
+
+    @classmethod
+    def _flush_updates(cls, doc):
+        """
+        Applies all model updates queued on the supplied document.
+        """
+        pending = cls._pending_updates.pop(doc, {})
+        for model, msg in pending.values():
+            model.update(**msg)
+
     def _link_params(self, model, params, doc, root, comm=None):
         def param_change(*events):
-            msgs = []
+            msg = {}
             for event in events:
-                msg = self._process_param_change({event.name: event.new})
-                msg = {k: v for k, v in msg.items() if k not in self._active}
-                if msg:
-                    msgs.append(msg)
-
-            if not msgs: return
+                change = self._process_param_change({event.name: event.new})
+                msg.update({k: v for k, v in change.items()
+                            if k not in self._active})
 
-            def update_model():
-                for msg in msgs:
-                    model.update(**msg)
+            if not msg: return
 
             if comm:
-                self._expecting += [m for msg in msgs for m in msg]
-                update_model()
-                push(doc, comm)
-            else:
-                doc.add_next_tick_callback(update_model)
+                self._expecting += list(msg)
+            self._update_models(doc, [(model, msg)], comm)
 
         ref = model.ref['id']
-        watcher = self.param.watch(param_change, params)
+        watcher = self.param.watch(self._holdable(param_change), params)
         self._callbacks[ref].append(watcher)
 
     def _link_props(self, model, properties, doc, root, comm=None):
@@ -368,10 +470,10 @@ class Reactive(Viewable):
     def _server_change(self, doc, attr, old, new):
         self._events.update({attr: new})
         if not self._active:
-            doc.add_timeout_callback(self._change_event, self._debounce)
+            doc.add_timeout_callback(partial(self._change_event, doc), self._debounce)
         self._active = list(self._events)
 
-    def _change_event(self):
+    def _change_event(self, doc=None):
         self.set_param(**self._process_property_change(self._events))
         self._events = {}
         self._active = []
@@ -5,6 +5,8 @@ communication between the rendered dashboard and the Widget parameters.
 from __future__ import absolute_import
 
 import ast
+import json
+import time
 from collections import OrderedDict
 from datetime import datetime
 
@@ -22,7 +24,7 @@ from bokeh.models.widgets import (
 
 from .layout import WidgetBox # noqa
 from .viewable import Reactive
-from .util import as_unicode, push, value_as_datetime, hashable
+from .util import as_unicode, value_as_datetime, hashable
 
 
 class Widget(Reactive):
@@ -74,6 +76,18 @@ class Widget(Reactive):
             return parent
         return model
 
+    def _get_embed_state(self, model):
+        """
+        Returns the information required to embed all states of the
+        widget in a static page or None if the widget does not take a
+        discrete set of values. The information consists of the bokeh
+        model and property which change, the list of values the widget
+        may take, the body of a JS function which returns the index of
+        the current value given the model and a dictionary of any
+        additional models the JS code references by name.
+        """
+        return None
+
 
 class TextInput(Widget):
 
@@ -116,7 +130,100 @@ class AutocompleteInput(Widget):
     _rename = {'name': 'title', 'options': 'completions'}
 
 
-class FloatSlider(Widget):
+class _SliderBase(Widget):
+    """
+    Baseclass for sliders which supports rate limiting the updates
+    made while a slider is being dragged. The value_throttled parameter
+    is updated at most once every `throttle` milliseconds, always
+    including the first (leading) and last (trailing) value of a drag.
+    If throttled is enabled the value parameter is also rate limited.
+    Throttling may be enabled for all sliders by setting
+    _SliderBase.throttled = True.
+    """
+
+    throttled = param.Boolean(default=False, doc="""
+        Whether changes to the value made in the frontend are rate
+        limited.""")
+
+    throttle = param.Integer(default=200, bounds=(0, None), doc="""
+        Minimum interval between throttled updates in milliseconds.""")
+
+    value_throttled = param.Parameter(default=None, doc="""
+        The value of the slider, updated at most once every throttle
+        interval while the slider is dragged.""")
+
+    __abstract = True
+
+    _throttle_params = ['throttled', 'throttle', 'value_throttled']
+
+    def __init__(self, **params):
+        super(_SliderBase, self).__init__(**params)
+        self._last_throttled = 0
+        self._pending_throttled = []
+        self._frontend_change = False
+        self.value_throttled = self.value
+        self.param.watch(self._sync_throttled, 'value')
+
+    def _sync_throttled(self, event):
+        if not self._frontend_change:
+            self.value_throttled = event.new
+
+    def _process_param_change(self, msg):
+        msg = {k: v for k, v in msg.items() if k not in self._throttle_params}
+        return super(_SliderBase, self)._process_param_change(msg)
+
+    def _change_event(self, doc=None):
+        msg = self._process_property_change(self._events)
+        self._frontend_change = True
+        try:
+            self.set_param(**{k: v for k, v in msg.items()
+                              if k != 'value' or not self.throttled})
+        finally:
+            self._frontend_change = False
+            self._events = {}
+            self._active = []
+        if 'value' in msg:
+            self._throttle_value(msg['value'], doc)
+
+    def _throttle_value(self, value, doc=None):
+        """
+        Applies the value immediately if no update happened within the
+        throttle interval, otherwise schedules it to be applied at the
+        end of the interval, superseding any earlier pending value.
+        """
+        elapsed = (time.time() - self._last_throttled) * 1000
+        if not self._pending_throttled and elapsed >= self.throttle:
+            self._apply_throttled(value)
+            return
+        if not self._pending_throttled:
+            delay = max(self.throttle - elapsed, 0)
+            if doc is None:
+                from tornado.ioloop import IOLoop
+                IOLoop.current().call_later(delay/1000., self._trailing_edge)
+            else:
+                doc.add_timeout_callback(self._trailing_edge, delay)
+        self._pending_throttled[:] = [value]
+
+    def _trailing_edge(self):
+        if self._pending_throttled:
+            self._apply_throttled(self._pending_throttled.pop())
+
+    def _apply_throttled(self, value):
+        self._last_throttled = time.time()
+        updates = {'value_throttled': value}
+        if self.throttled:
+            updates['value'] = value
+        # Avoid echoing the value back to the frontend mid-drag
+        self._active = ['value']
+        self._frontend_change = True
+        try:
+            self.set_param(**updates)
+        finally:
+            self._active = []
+            self._frontend_change = False
+
+
+class FloatSlider(_SliderBase):
 
     start = param.Number(default=0.0)
 
@@ -129,7 +236,7 @@ class FloatSlider(Widget):
     _widget_type = _BkSlider
 
 
-class IntSlider(Widget):
+class IntSlider(_SliderBase):
 
     value = param.Integer(default=0)
 
@@ -161,7 +268,7 @@ class DatePicker(Widget):
         return msg
 
 
-class RangeSlider(Widget):
+class RangeSlider(_SliderBase):
 
     value = param.NumericTuple(default=(0, 1), length=2)
 
@@ -180,7 +287,7 @@ class RangeSlider(Widget):
         return msg
 
 
-class DateRangeSlider(Widget):
+class DateRangeSlider(_SliderBase):
 
     value = param.Tuple(default=None, length=2)
 
@@ -367,6 +474,12 @@ class Checkbox(Widget):
             msg['labels'] = [msg.pop('title')]
         return msg
 
+    def _get_embed_state(self, model):
+        if isinstance(model, _BkWidgetBox):
+            model = model.children[0]
+        code = 'return model.active.indexOf(0) >= 0 ? 1 : 0;'
+        return model, 'active', [False, True], code, {}
+
 
 class Select(Widget):
 
@@ -401,6 +514,12 @@ class Select(Widget):
         msg.pop('options', None)
         return msg
 
+    def _get_embed_state(self, model):
+        if isinstance(model, _BkWidgetBox):
+            model = model.children[0]
+        code = 'return %s.indexOf(model.value);' % json.dumps(list(self.options))
+        return model, 'value', list(self.options.values()), code, {}
+
 
 class RadioButtons(Select):
 
@@ -424,6 +543,9 @@ class RadioButtons(Select):
             msg['value'] = [list(self.options.values())[a] for a in msg.pop('active')]
         return msg
 
+    def _get_embed_state(self, model):
+        return None
+
 
 class ToggleButtons(RadioButtons):
 
@@ -452,8 +574,11 @@ class MultiSelect(Select):
         msg.pop('options', None)
         return msg
 
+    def _get_embed_state(self, model):
+        return None
+
 
-class DiscreteSlider(Widget):
+class DiscreteSlider(_SliderBase):
 
     options = param.ClassSelector(default=[], class_=(dict, list))
 
@@ -513,21 +638,15 @@ class DiscreteSlider(Widget):
             if not combined_msg:
                 return
 
-            def update_model():
-                slider.update(**{k: v for k, v in combined_msg.items()
-                                 if k in slider.properties()})
-                div.update(**{k: v for k, v in combined_msg.items()
-                              if k in div.properties()})
-
-            if comm:
-                update_model()
-                push(doc, comm)
-            else:
-                doc.add_next_tick_callback(update_model)
+            slider_msg = {k: v for k, v in combined_msg.items()
+                          if k in slider.properties()}
+            div_msg = {k: v for k, v in combined_msg.items()
+                       if k in div.properties()}
+            self._update_models(doc, [(slider, slider_msg), (div, div_msg)], comm)
 
         ref = model.ref['id']
-        for p in params:
-            self._callbacks[ref].append(self.param.watch(param_change, p))
+        watcher = self.param.watch(self._holdable(param_change), params)
+        self._callbacks[ref].append(watcher)
 
     def _process_param_change(self, msg):
         title = '<b>%s</b>: ' % (self.name if self.name else '')
@@ -559,3 +678,9 @@ class DiscreteSlider(Widget):
         if 'value' in msg:
             msg['value'] = self.values[msg['value']]
         return msg
+
+    def _get_embed_state(self, model):
+        div, slider = model.children
+        code = ('div.text = %s[model.value];\nreturn model.value;'
+                % json.dumps(self.labels))
+        return slider, 'value', self.values, code, {'div': div}